@@ -1,37 +1,24 @@
 from textwrap import dedent
-from utils.const import DATASET_STOCK, WORK_DIR, DATASET_SIGNALS
+from utils.const import DATASET_STOCK
 from autogen import GroupChat, GroupChatManager, ConversableAgent
-from typing import Union, Literal, Dict
+from typing import Dict
 from utils.const import AgentName
-import os
+from agent.speaker_router import SpeakerRouter
 
 class GroupChatManagerBase:
-    def __init__(self, agents_registry: Dict[AgentName, ConversableAgent], llm_config: Dict):
+    def __init__(
+        self,
+        agents_registry: Dict[AgentName, ConversableAgent],
+        llm_config: Dict,
+    ):
         self.__agents_registry = agents_registry
         self.__llm_config = llm_config
+        # Routes every turn by rules; the selection prompts below only apply
+        # if the router is swapped for "auto"
+        self.speaker_router = SpeakerRouter()
         self._group_chat = self.create_group_chat()
         self._group_chat_manager = self.create_group_chat_manager()
 
-    @staticmethod
-    def _custom_speaker_selection_func(
-        last_speaker: ConversableAgent, groupchat: GroupChat
-    ) -> Union[ConversableAgent, Literal["auto", "manual", "random", "round_robin"], None]:
-        stock_data_path = os.path.join(WORK_DIR, DATASET_STOCK)
-        stock_signals_path = os.path.join(WORK_DIR, DATASET_SIGNALS)
-        messages = groupchat.messages
-
-        if last_speaker.name == "custom_signal_analysis_agent" and not os.path.exists(stock_signals_path):
-            return groupchat.agent_by_name("user_proxy")
-        elif last_speaker.name == "user_proxy":
-            if "exitcode: 1" in messages[-1]["content"]:
-                return groupchat.agent_by_name("custom_signal_analysis_agent")
-            elif not os.path.exists(stock_data_path):
-                return groupchat.agent_by_name("stock_analysis_agent")
-            else:
-                return "auto"
-        else:
-            return "auto"
-        
     @staticmethod
     def _speaker_select_msg_prompt() -> str:
         return dedent(
@@ -77,7 +64,7 @@ class GroupChatManagerBase:
             speaker_transitions_type="allowed",
             messages=[],
             max_round=10,
-            speaker_selection_method=self._custom_speaker_selection_func,
+            speaker_selection_method=self.speaker_router,
             select_speaker_message_template=self._speaker_select_msg_prompt(),
             select_speaker_prompt_template=self._speaker_select_prompt(),
             max_retries_for_selecting_speaker=5,
@@ -23,15 +23,23 @@ class SignalAnalysisAgent:
             4. Do not include the code for backtesting the strategy.
             5. Create only python function `generate_signals`.  Do not create other function.
             6. Include the columns `BuySignal`, `SellSignal`, and `Description` in the DataFrame.
+                - Save them with `write_signals(file_output_path, df["BuySignal"], df["SellSignal"], description, provenance={{"input_file": INPUT_FILE}})`. Never use `to_csv` for the output file.
             7. Use "Adj Close" exclusively as the price column for generating signals. Never use "Close".
                 - Never use `df["Close"]` or `df['Close']` in the code.
                 - Use `df["Adj Close"]` or `df['Adj Close']` instead.
             8. Use `ta` library document in the following link: https://technical-analysis-library-in-python.readthedocs.io/en/latest/ta.html
-            9. Use the following code template for importing libraries and defining variables:  
+            9. Compute every `ta` indicator through `cached_indicator` so results are shared across strategies.
+                - Pass the `ta` function first and all of its inputs as keyword arguments: `cached_indicator(ta.trend.sma_indicator, close=df["Adj Close"], window=10)`.
+                - For class-based indicators, name the output method: `cached_indicator(ta.trend.MACD, output="macd_diff", close=df["Adj Close"])`.
+                - Indicators with `ta` default parameters are precomputed: `features = load_features(file_input_path)` returns columns named like `ta.add_all_ta_features` (e.g. `momentum_rsi`, `trend_macd_diff`, `volatility_bbh`) aligned with the rows of `df`. Prefer these columns when the default parameters fit the strategy.
+            10. Use the following code template for importing libraries and defining variables:  
                 ```
                 import ta
                 import pandas as pd
                 import os
+                from utils.indicator_cache import cached_indicator
+                from utils.feature_store import load_features
+                from utils.signal_io import write_signals
 
                 WORK_DIR = '.'
                 INPUT_FILE = {DATASET_STOCK}
@@ -49,7 +57,10 @@ class SignalAnalysisAgent:
                 ```python
                 import ta
                 import pandas as pd
-                import os   
+                import os
+                from utils.indicator_cache import cached_indicator
+                from utils.feature_store import load_features
+                from utils.signal_io import write_signals
 
                 WORK_DIR = '.'
                 INPUT_FILE = {DATASET_STOCK}
@@ -62,19 +73,23 @@ class SignalAnalysisAgent:
                         file_input_path = os.path.join(abs_path, INPUT_FILE)
                         df = pd.read_csv(file_input_path)
 
-                        df["MA10"] = ta.trend.sma_indicator(df["Adj Close"], window=10)
-                        df["MACD"] = ta.trend.MACD(df["Adj Close"])
+                        df["MA10"] = cached_indicator(ta.trend.sma_indicator, close=df["Adj Close"], window=10)
+                        df["MACD"] = cached_indicator(ta.trend.MACD, output="macd", close=df["Adj Close"])
                         df["BuySignal"] = (df["Adj Close"] > df["MA10"]) & (df["MACD"] > 0)
                         df["SellSignal"] = (df["Adj Close"] < df["MA10"]) & (df["MACD"] < 0)
                         df["Description"] = "Generated signals using MACD and Moving Average 10 days"
 
                         df["BuySignal"] = df["BuySignal"].fillna(False)
                         df["SellSignal"] = df["SellSignal"].fillna(False)
-                        
-                        df_output = df[["BuySignal", "SellSignal", "Description"]]
 
-                        file_output_path = os.path.join(abs_path, OUTPUT_FILE),
-                        df_output.to_csv(file_output_path, index=False)   
+                        file_output_path = os.path.join(abs_path, OUTPUT_FILE)
+                        write_signals(
+                            file_output_path,
+                            df["BuySignal"],
+                            df["SellSignal"],
+                            df["Description"].iloc[0],
+                            provenance={{"input_file": INPUT_FILE}},
+                        )
 
                         print(f"Signals generated and saved to {{file_output_path}}")
                     except Exception as e:
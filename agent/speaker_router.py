@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+from autogen import Agent, GroupChat
+from utils.const import AgentName
+from utils.datamodels import SpeakerSelectionStats
+
+STOCK_DATA_TOOL = "create_stock_data"
+SUCCESS_EXIT_CODE = "exitcode: 0"
+
+STOCK_ANALYSIS_AGENT = AgentName.STOCK_ANALYSIS_AGENT.value
+CUSTOM_SIGNAL_ANALYSIS_AGENT = AgentName.CUSTOM_SIGNAL_ANALYSIS_AGENT.value
+USER_PROXY = AgentName.USER_PROXY.value
+
+
+@dataclass
+class PipelineState:
+    data_ready: bool = False
+    signals_ready: bool = False
+
+
+def _is_error(content: Any) -> bool:
+    return str(content or "").lstrip().startswith("Error")
+
+
+def pipeline_state(messages: List[Dict[str, Any]]) -> PipelineState:
+    """
+    Stages of the analysis pipeline completed in a group chat, read from the
+    `create_stock_data` tool results and from code execution results.
+    """
+    state = PipelineState()
+    tool_names: Dict[str, str] = {}
+    for message in messages:
+        for tool_call in message.get("tool_calls") or []:
+            tool_names[tool_call.get("id")] = tool_call["function"]["name"]
+        for tool_response in message.get("tool_responses") or []:
+            tool_name = tool_names.get(tool_response.get("tool_call_id"))
+            if tool_name == STOCK_DATA_TOOL and not _is_error(tool_response.get("content")):
+                state.data_ready = True
+        content = message.get("content")
+        if isinstance(content, str) and content.startswith(SUCCESS_EXIT_CODE):
+            state.signals_ready = True
+    return state
+
+
+def _next_stage_speaker(state: PipelineState) -> str:
+    if not state.data_ready:
+        return STOCK_ANALYSIS_AGENT
+    if not state.signals_ready:
+        return CUSTOM_SIGNAL_ANALYSIS_AGENT
+    # Backtest, then report the metrics and TERMINATE
+    return STOCK_ANALYSIS_AGENT
+
+
+def next_speaker_name(
+    last_speaker_name: str, last_message: Dict[str, Any], state: PipelineState
+) -> str:
+    """
+    Next speaker of the fixed pipeline: stock data -> signal code -> execute ->
+    backtest -> terminate.
+    """
+    if last_message.get("tool_calls"):
+        # `user_proxy` executes the tools of `stock_analysis_agent`
+        return USER_PROXY
+    if last_speaker_name == CUSTOM_SIGNAL_ANALYSIS_AGENT:
+        return USER_PROXY
+    if last_speaker_name == USER_PROXY:
+        content = str(last_message.get("content") or "")
+        if content.startswith("exitcode:") and not content.startswith(SUCCESS_EXIT_CODE):
+            # Failed or rejected signal code goes back to its author
+            return CUSTOM_SIGNAL_ANALYSIS_AGENT
+        return _next_stage_speaker(state)
+    # `stock_analysis_agent` replied without a tool call
+    if state.data_ready and not state.signals_ready:
+        return CUSTOM_SIGNAL_ANALYSIS_AGENT
+    return USER_PROXY
+
+
+def _needed_llm_selection(
+    last_speaker_name: str, last_message: Dict[str, Any], state: PipelineState
+) -> bool:
+    # Whether the previous selection function returned "auto" for this turn
+    if last_speaker_name == CUSTOM_SIGNAL_ANALYSIS_AGENT:
+        return state.signals_ready
+    if last_speaker_name == USER_PROXY:
+        return "exitcode: 1" not in str(last_message.get("content") or "") and state.data_ready
+    return True
+
+
+class SpeakerRouter:
+    """
+    Speaker selection method of the analysis group chat that routes every turn
+    by rules instead of asking the LLM, and counts the selection calls and
+    tokens this saves.
+    """
+
+    def __init__(self):
+        self.stats = SpeakerSelectionStats()
+
+    def __call__(self, last_speaker: Agent, groupchat: GroupChat) -> Agent:
+        last_message = groupchat.messages[-1]
+        state = pipeline_state(groupchat.messages)
+        speaker_name = next_speaker_name(last_speaker.name, last_message, state)
+
+        self.stats.routed_turns += 1
+        transition = f"{last_speaker.name}->{speaker_name}"
+        self.stats.transitions[transition] = self.stats.transitions.get(transition, 0) + 1
+        if _needed_llm_selection(last_speaker.name, last_message, state):
+            self.stats.llm_selections_saved += 1
+            self.stats.estimated_tokens_saved += self._selection_prompt_tokens(groupchat)
+        return groupchat.agent_by_name(speaker_name)
+
+    @staticmethod
+    def _selection_prompt_tokens(groupchat: GroupChat) -> int:
+        # The "auto" selection sends the selector system message, the chat so
+        # far and the selection prompt
+        text = "".join(
+            [
+                groupchat.select_speaker_msg(groupchat.agents),
+                *(str(message.get("content") or "") for message in groupchat.messages),
+                groupchat.select_speaker_prompt(groupchat.agents),
+            ]
+        )
+        return len(text) // 4
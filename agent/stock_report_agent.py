@@ -1,6 +1,7 @@
 import autogen
 from typing import Dict
 from autogen import ConversableAgent
+from utils.const import WORK_DIR
 from utils.llm_tool_use import PlotToolRegistry
 
 
@@ -30,6 +31,12 @@ class StockReportAgent:
             llm_config=self.__llm_config,
         )
     
-    def register_tools(self, user_proxy: ConversableAgent, stock_analysis_agent: ConversableAgent):
-        tool_registry = PlotToolRegistry(user_proxy, stock_analysis_agent)
+    def register_tools(
+        self,
+        user_proxy: ConversableAgent,
+        stock_analysis_agent: ConversableAgent,
+        work_dir: str = WORK_DIR,
+        async_tools: bool = False,
+    ):
+        tool_registry = PlotToolRegistry(user_proxy, stock_analysis_agent, work_dir, async_tools)
         tool_registry.register_tools()
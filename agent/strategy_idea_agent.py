@@ -2,6 +2,8 @@ from textwrap import dedent
 from typing import Dict
 from autogen import ConversableAgent, AssistantAgent
 from utils.const import STRATEGY_IDEAS, WORK_DIR, AgentName
+from utils.feature_store import feature_columns
+from utils.price_store import PRICE_COLUMNS
 from utils.llm_tool_use import JsonToolRegistry
 
 
@@ -26,6 +28,17 @@ class StrategyIdeaAgent(ConversableAgent):
             3. Store the output named "{STRATEGY_IDEAS}" in "{WORK_DIR}" with the Desired Output format.
             4. Do not include any messages or descriptions in the output, except for the JSON data.
             5. If generated JSON data is not valid, recreate the JSON file.
+            6. When the investing conditions are simple thresholds or crossovers, add "rules" with the Signal Rules format.
+                - Omit "rules" when the conditions cannot be expressed exactly with the Signal Rules format.
+
+            ## Signal Rules:
+                "rules" holds a "buy" and a "sell" condition. A condition is one of:
+                - {{"all": [condition, ...]}}, {{"any": [condition, ...]}}, {{"not": condition}}
+                - {{"gt": [operand, operand]}}, {{"ge": [...]}}, {{"lt": [...]}}, {{"le": [...]}}
+                - {{"cross_above": [operand, operand]}}, {{"cross_below": [operand, operand]}}
+                An operand is a number or one of the following columns (indicators use the `ta` library default parameters):
+                - Price: {", ".join(PRICE_COLUMNS)}
+                - Indicators: {", ".join(feature_columns())}
 
             ## Technical Indicators:
 
@@ -86,7 +99,11 @@ class StrategyIdeaAgent(ConversableAgent):
                     "description": "Use the RSI to identify overbought and oversold conditions for potential reversals.",
                     "rationale": "An RSI above 70 indicates overbought conditions, while below 30 indicates oversold conditions, suggesting potential reversals.",
                     "investing_conditions": "Buy when RSI is below 30; sell when RSI is above 70.",
-                    "expected_outcome": "Enter positions at favorable prices, benefiting from market corrections."
+                    "expected_outcome": "Enter positions at favorable prices, benefiting from market corrections.",
+                    "rules": {{
+                        "buy": {{"lt": ["momentum_rsi", 30]}},
+                        "sell": {{"gt": ["momentum_rsi", 70]}}
+                    }}
                 }}
             ]
             """
@@ -1,29 +1,88 @@
+import asyncio
+import os
 from textwrap import dedent
-from autogen import ConversableAgent
-from utils.const import DATASET_SIGNALS, WORK_DIR
-from autogen.coding import LocalCommandLineCodeExecutor
+from typing import Any, Dict, List, Optional
+from autogen import Agent, ConversableAgent
+from utils.const import CODE_EXECUTOR, DATASET_SIGNALS, WORK_DIR
+from autogen.coding import CodeExecutor, LocalCommandLineCodeExecutor
+from utils.code_validator import ValidatingCodeExecutor
+from utils.warm_executor import WarmPythonCodeExecutor
 import autogen
 
 
+# Generated code runs in WORK_DIR and imports helpers such as
+# `utils.indicator_cache`, so the repository root must be importable there
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _add_repo_root_to_pythonpath() -> None:
+    paths = os.environ.get("PYTHONPATH", "").split(os.pathsep)
+    if REPO_ROOT not in paths:
+        os.environ["PYTHONPATH"] = os.pathsep.join([REPO_ROOT, *filter(None, paths)])
+
+
+async def _a_generate_code_execution_reply(
+    recipient: ConversableAgent,
+    messages: Optional[List[Dict[str, Any]]] = None,
+    sender: Optional[Agent] = None,
+    config: Optional[Any] = None,
+):
+    # Code execution blocks, so in async chats it runs in a thread and other
+    # strategies keep talking to the LLM meanwhile
+    return await asyncio.to_thread(
+        recipient._generate_code_execution_reply_using_executor, messages, sender
+    )
+
+
+def _register_async_code_execution(user_proxy: ConversableAgent) -> None:
+    # Right before the sync executor reply, so termination checks still come first
+    position = next(
+        i
+        for i, reply in enumerate(user_proxy._reply_func_list)
+        if reply["reply_func"] is ConversableAgent._generate_code_execution_reply_using_executor
+    )
+    user_proxy.register_reply(
+        [Agent, None],
+        _a_generate_code_execution_reply,
+        position=position,
+        ignore_async_in_sync_chat=True,
+    )
+
+
 class BaseUserProxyAgent:
-    def __init__(self):
+    def __init__(self, work_dir: str = WORK_DIR):
         self.__user_proxy_prompt = self._user_proxy_prompt()
+        self._work_dir = work_dir
 
     def create_user_proxy(self) -> ConversableAgent:
         """Create the user proxy agent with common configurations."""
-        return autogen.UserProxyAgent(
+        _add_repo_root_to_pythonpath()
+        user_proxy = autogen.UserProxyAgent(
             name="user_proxy",
             is_termination_msg=lambda x: x.get("content", "") is not None
             and str(x.get("content", "")).rstrip().endswith("TERMINATE"),
             human_input_mode="NEVER",  # Literal['ALWAYS', 'TERMINATE', 'NEVER']
             max_consecutive_auto_reply=15,
-            code_execution_config={
-                "executor": LocalCommandLineCodeExecutor(
-                    work_dir=WORK_DIR, timeout=600, execution_policies={"python": True}
-                ),
-            },
+            code_execution_config={"executor": self._create_code_executor(self._work_dir)},
             system_message=self.__user_proxy_prompt,
         )
+        _register_async_code_execution(user_proxy)
+        return user_proxy
+
+    @staticmethod
+    def _create_code_executor(work_dir: str = WORK_DIR) -> CodeExecutor:
+        # Generated code is checked in-process before it reaches the executor
+        if CODE_EXECUTOR == "warm":
+            return ValidatingCodeExecutor(WarmPythonCodeExecutor(work_dir=work_dir, timeout=600))
+        elif CODE_EXECUTOR == "local":
+            return ValidatingCodeExecutor(
+                LocalCommandLineCodeExecutor(
+                    work_dir=work_dir, timeout=600, execution_policies={"python": True}
+                )
+            )
+        raise ValueError(
+            f"Unsupported code executor: {CODE_EXECUTOR}. Use 'warm' or 'local'."
+        )
 
     @staticmethod
     def _user_proxy_prompt() -> str:
@@ -15,12 +15,12 @@ from agent.group_chat_manager import GroupChatManagerBase
 from agent.agent_registry import AgentRegistry
 
 
-def setup_agents(llm_config: Dict) -> Tuple:
+def setup_agents(llm_config: Dict, work_dir: str = WORK_DIR) -> Tuple:
     sa = StockAnalysisAgent(llm_config=llm_config)
     stock_analysis_agent = sa.create_agent()
     ca = SignalAnalysisAgent(llm_config=llm_config)
     custom_signal_analysis_agent = ca.create_agent()
-    up = UserProxyAgent()
+    up = UserProxyAgent(work_dir=work_dir)
     user_proxy = up.create_user_proxy()
 
     agents_registry_base = AgentRegistry()
@@ -41,8 +41,12 @@ def setup_agents(llm_config: Dict) -> Tuple:
     )
 
 
-def register_tools(agents_registry: Dict[AgentName, ConversableAgent]):
-    tool_registry = ToolRegistry(agents_registry)
+def register_tools(
+    agents_registry: Dict[AgentName, ConversableAgent],
+    work_dir: str = WORK_DIR,
+    async_tools: bool = False,
+):
+    tool_registry = ToolRegistry(agents_registry, work_dir, async_tools)
     tool_registry.register_tools()
 
 
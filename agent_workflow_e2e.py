@@ -1,59 +1,87 @@
 import asyncio
 import json
 import os
-import re
 import autogen
+import click
 import time
+from functools import lru_cache
 from textwrap import dedent
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from datetime import datetime
-from autogen import ChatResult
+from autogen import ChatResult, ConversableAgent, GroupChatManager
+from autogen.coding import CodeBlock, CodeExecutor
+from agent.signal_analysis_agent import SignalAnalysisAgent
 from agent.strategy_idea_agent import StrategyIdeaAgent
 from agent.stock_report_agent import StockReportAgent
-from agent.user_proxy_agent import UserProxyReportAgent
+from agent.user_proxy_agent import UserProxyAgent, UserProxyReportAgent
 from agent_quant import register_tools, setup_agents
 from utils.const import (
     BACKTEST_METRICS_FILE,
+    BACKTEST_RESULTS_EXCEL_FILE,
     BACKTEST_RESULTS_FILE,
+    BACKTEST_RESULTS_FORMAT,
     CHAT_SUMMARY_FILE_NAME,
+    CODE_VALIDATION_STATS_FILE,
+    SPEAKER_SELECTION_STATS_FILE,
     DATASET_SIGNALS,
     DATASET_STOCK,
     PLOT_FILE_NAME,
     SUMMARY_PROMPT,
     WORK_DIR,
+    WORKFLOW_CONCURRENCY,
+    WORKFLOW_MODE,
     STRATEGY_IDEAS,
     AgentName,
 )
-from utils.datamodels import WorkFlowTasks
-from utils.functions import backtest_stock_strategy
+from utils.datamodels import WorkflowStats, WorkFlowTasks
+from utils.functions import backtest_stock_strategy, export_backtest_results_to_excel
+from utils.run_manifest import STAGES, RunManifest, StrategyCheckpoint
+from utils.signal_code_cache import SignalCodeCache, last_executed_code, signal_code_key
+from utils.signal_rules import generate_rule_signals
+from utils.workspace import StrategyWorkspace, link_stock_data, sanitize_dir_name
 from utils.llm_config import load_config
+from utils.llm_plot import plot_backtest_results
 
 
 load_dotenv()
 config_file_path = os.path.join(os.path.dirname(__file__), "OAI_CONFIG_LIST.json")
-llm_config = load_config(config_file_path)
 
-# 1. Create a user proxy agent
-user_report_proxy = UserProxyReportAgent().create_user_proxy()
 
-# 2. Create a strategy idea agent
-strategy_idea_agent_base = StrategyIdeaAgent(llm_config=llm_config)
-strategy_idea_agent = strategy_idea_agent_base.create_agent()
-strategy_idea_agent_base.register_tools(user_report_proxy, strategy_idea_agent)
+@lru_cache(maxsize=None)
+def get_llm_config() -> Dict:
+    # Loaded on first use, so `--no-llm` runs need no LLM configuration
+    return load_config(config_file_path)
 
-# 3. Create a stock performance group chat
-(
-    agents_registry,
-    group_chat,
-    group_chat_manager,
-) = setup_agents(llm_config)
-register_tools(agents_registry)
 
-# 4. Create a stock report agent
-stock_report_agent_base = StockReportAgent(llm_config=llm_config)
-stock_report_agent = stock_report_agent_base.create_agent()
-stock_report_agent_base.register_tools(user_report_proxy, stock_report_agent)
+def setup_strategy_idea_agents() -> Tuple[ConversableAgent, ConversableAgent]:
+    llm_config = get_llm_config()
+
+    # 1. Create a user proxy agent
+    user_report_proxy = UserProxyReportAgent().create_user_proxy()
+
+    # 2. Create a strategy idea agent
+    strategy_idea_agent_base = StrategyIdeaAgent(llm_config=llm_config)
+    strategy_idea_agent = strategy_idea_agent_base.create_agent()
+    strategy_idea_agent_base.register_tools(user_report_proxy, strategy_idea_agent)
+    return user_report_proxy, strategy_idea_agent
+
+
+def setup_strategy_agents(work_dir: str, async_tools: bool = False) -> Tuple:
+    # 3. The stock performance group chat and the stock report agent are created per
+    # strategy, so each strategy works in its own workspace. Async chats get
+    # tools that run in a thread, see `to_thread_tool`
+    llm_config = get_llm_config()
+    agents_registry, _, group_chat_manager = setup_agents(llm_config, work_dir=work_dir)
+    register_tools(agents_registry, work_dir=work_dir, async_tools=async_tools)
+
+    stock_report_agent_base = StockReportAgent(llm_config=llm_config)
+    report_proxy = UserProxyReportAgent(work_dir=work_dir).create_user_proxy()
+    stock_report_agent = stock_report_agent_base.create_agent()
+    stock_report_agent_base.register_tools(
+        report_proxy, stock_report_agent, work_dir=work_dir, async_tools=async_tools
+    )
+    return agents_registry, group_chat_manager, report_proxy, stock_report_agent
 
 
 def genereate_strategy_analysis_request_message(
@@ -75,19 +103,21 @@ def genereate_strategy_analysis_request_message(
     return msg
 
 
+def strategy_output_dir(strategy_idea: Dict) -> str:
+    return os.path.join(WORK_DIR, sanitize_dir_name(strategy_idea.get("strategy")))
+
+
 def save_stock_performance_data(
-    strategy_idea: Dict, chat_res: ChatResult, custom_signal_agent_messages: List[Dict], verbose_output: bool = False
+    strategy_idea: Dict,
+    chat_res: ChatResult,
+    custom_signal_agent_messages: List[Dict],
+    workspace: StrategyWorkspace,
+    verbose_output: bool = False,
+    export_excel: bool = False,
 ):
-    stock_performance_dir_name: str = strategy_idea.get("strategy")
     # make dir for stock performance data
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized_stock_performance_dir_name = re.sub(
-        invalid_chars, "_", stock_performance_dir_name
-    )
-
-    os.makedirs(
-        os.path.join(WORK_DIR, sanitized_stock_performance_dir_name), exist_ok=True
-    )
+    stock_performance_dir = strategy_output_dir(strategy_idea)
+    os.makedirs(stock_performance_dir, exist_ok=True)
     time.sleep(0.1)
 
     # Generate the chat summary
@@ -115,7 +145,7 @@ def save_stock_performance_data(
 
     # Save the chat summary to the stock performance dir
     with open(
-        os.path.join(WORK_DIR, stock_performance_dir_name, CHAT_SUMMARY_FILE_NAME), "w", encoding="utf-8"
+        os.path.join(stock_performance_dir, CHAT_SUMMARY_FILE_NAME), "w", encoding="utf-8"
     ) as f:
         sep = "-" * 50
         f.write(chat_summary_output)
@@ -123,52 +153,300 @@ def save_stock_performance_data(
 
     # Save results to the stock performance dir
     if verbose_output:
-        # copy the files to the stock performance dir
-        file_names = [
-            BACKTEST_RESULTS_FILE,
-            BACKTEST_METRICS_FILE,
-            DATASET_STOCK,
-            DATASET_SIGNALS,
-            PLOT_FILE_NAME,
-        ]
-        for file_name in file_names:
-            src_file_path = os.path.join(WORK_DIR, file_name)
-            dest_file_path = os.path.join(
-                WORK_DIR, stock_performance_dir_name, file_name
+        if export_excel and BACKTEST_RESULTS_FORMAT != "xlsx":
+            # Excel is only written on demand, the workflow itself uses the fast
+            # format; xlsx results are published below under the same name
+            export_backtest_results_to_excel(
+                workspace.path(BACKTEST_RESULTS_FILE),
+                os.path.join(stock_performance_dir, BACKTEST_RESULTS_EXCEL_FILE),
             )
-            if os.path.exists(dest_file_path):
-                # Remove the existing file
-                os.remove(dest_file_path)
-            # Move the file to the stock performance dir
-            os.rename(src_file_path, dest_file_path)
+        # move the files from the strategy workspace to the stock performance dir
+        workspace.publish(
+            [
+                BACKTEST_RESULTS_FILE,
+                BACKTEST_METRICS_FILE,
+                DATASET_STOCK,
+                DATASET_SIGNALS,
+                PLOT_FILE_NAME,
+            ],
+            stock_performance_dir,
+        )
 
 
-# Define the agents that will be involved in the workflow
-# https://microsoft.github.io/autogen/docs/notebooks/agentchat_multi_task_async_chats#scenario-1-solve-the-tasks-with-a-series-of-chats
-def run_workflow(workflow_tasks: WorkFlowTasks):
-    # Create a chat with the strategy idea agent
-    # The agent will provide stock investing ideas using technical indicators
-    strategy_idea_json_path = os.path.join(
-        os.path.dirname(__file__), WORK_DIR, STRATEGY_IDEAS
+def run_direct_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    work_dir: str,
+    generate_signals: Callable[[str, str], None],
+    signal_source: str,
+) -> Optional[ChatResult]:
+    # Fetch prices, generate signals without the LLM group chat and backtest them
+    stock_signals_file_path = os.path.join(work_dir, DATASET_SIGNALS)
+    try:
+        stock_price_file_path = link_stock_data(
+            workflow_tasks.ticker,
+            workflow_tasks.start_date,
+            workflow_tasks.end_date or datetime.today().strftime("%Y-%m-%d"),
+            work_dir,
+        )
+        generate_signals(stock_price_file_path, stock_signals_file_path)
+        metrics = backtest_stock_strategy(
+            stock_price_file_path, stock_signals_file_path, work_dir=work_dir
+        )
+    except Exception as e:
+        print(f"Error in direct signal generation for strategy: {strategy_idea}. {e}")
+        return None
+    if isinstance(metrics, str):
+        print(f"Error in direct signal generation for strategy: {strategy_idea}. {metrics}")
+        return None
+
+    summary = os.linesep.join(
+        [signal_source] + [metric for metric in metrics.model_dump().values() if metric]
     )
-    if not os.path.exists(strategy_idea_json_path):
-        user_report_proxy.initiate_chat(
-            recipient=strategy_idea_agent,
-            message=workflow_tasks.stock_idea_task_description,
-            summary_method="last_msg",
+    return ChatResult(chat_history=[], summary=summary, cost={})
+
+
+def run_rule_strategy(
+    strategy_idea: Dict, workflow_tasks: WorkFlowTasks, work_dir: str
+) -> Optional[ChatResult]:
+    # Ideas with "rules" are compiled and backtested directly, without generating signal code
+    def generate_signals(stock_price_file_path: str, stock_signals_file_path: str):
+        generate_rule_signals(
+            stock_price_file_path,
+            strategy_idea["rules"],
+            stock_signals_file_path,
+            description=strategy_idea.get("description", ""),
         )
 
-    strategy_ideas = []
-    with open(strategy_idea_json_path, "r") as file:
-        strategy_ideas = json.load(file)
+    return run_direct_strategy(
+        strategy_idea,
+        workflow_tasks,
+        work_dir,
+        generate_signals,
+        f"Signal rules: {json.dumps(strategy_idea['rules'])}",
+    )
 
-    # Create a chat with the stock performance agent and stock report agent.
-    for strategy_idea in strategy_ideas:
-        # Perform investment analysis and generate buy/sell signals
-        # Perform backtesting and provide performance metrics
-        # Create a chat with the stock report agent to generate a plot of stock prices and investment returns over time
+
+def run_cached_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    work_dir: str,
+    code_executor: CodeExecutor,
+    code: str,
+) -> Optional[ChatResult]:
+    # Re-execute signal code that already ran successfully for this idea
+    def generate_signals(stock_price_file_path: str, stock_signals_file_path: str):
+        if os.path.exists(stock_signals_file_path):
+            os.remove(stock_signals_file_path)
+        result = code_executor.execute_code_blocks([CodeBlock(code=code, language="python")])
+        if result.exit_code != 0 or not os.path.exists(stock_signals_file_path):
+            raise RuntimeError(f"Cached signal code failed: {result.output}")
+
+    return run_direct_strategy(
+        strategy_idea,
+        workflow_tasks,
+        work_dir,
+        generate_signals,
+        f"Cached signal code:{os.linesep}```python{os.linesep}{code}{os.linesep}```",
+    )
+
+
+def run_fast_path(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    work_dir: str,
+    code_executor: CodeExecutor,
+    cached_code: Optional[str],
+    checkpoint: StrategyCheckpoint,
+) -> Optional[ChatResult]:
+    # Signals kept from an interrupted run, rules and cached signal code skip
+    # the group chat; the latter two need a ticker to fetch prices
+    if checkpoint.is_done("signals"):
+        print("Resuming strategy from the run manifest: ", strategy_idea)
+        return ChatResult(chat_history=[], summary=checkpoint.note("signals") or "", cost={})
+    chat_res = None
+    if strategy_idea.get("rules") and workflow_tasks.ticker:
+        chat_res = run_rule_strategy(strategy_idea, workflow_tasks, work_dir)
+    if chat_res is None and cached_code and workflow_tasks.ticker:
+        chat_res = run_cached_strategy(
+            strategy_idea, workflow_tasks, work_dir, code_executor, cached_code
+        )
+    return chat_res
+
+
+def cache_signal_code(
+    signal_code_cache: SignalCodeCache,
+    signal_code_cache_key: str,
+    strategy_idea: Dict,
+    custom_signal_agent: ConversableAgent,
+    group_chat_manager: GroupChatManager,
+    work_dir: str,
+):
+    # Keep the code that produced the signal file for the next run
+    executed_code = last_executed_code(custom_signal_agent.chat_messages[group_chat_manager])
+    if executed_code and os.path.exists(os.path.join(work_dir, DATASET_SIGNALS)):
+        signal_code_cache.put(signal_code_cache_key, strategy_idea, executed_code)
+
+
+def ensure_backtest_results(work_dir: str) -> bool:
+    # Workaround to handle the case when the backtest results file is not generated
+    backtest_result_file_path = os.path.join(work_dir, BACKTEST_RESULTS_FILE)
+    if not os.path.exists(backtest_result_file_path):
+        stock_price_file_path = os.path.join(work_dir, DATASET_STOCK)
+        stock_signals_file_path = os.path.join(work_dir, DATASET_SIGNALS)
+        # Execute the backtesting strategy manually calling the function again.
+        backtest_stock_strategy(
+            stock_price_file_path, stock_signals_file_path, work_dir=work_dir
+        )
+    return os.path.exists(backtest_result_file_path)
+
+
+def report_succeeded(report_proxy: ConversableAgent, stock_report_agent: ConversableAgent) -> bool:
+    # Get the chat messages for the stock report agent
+    stock_report_agent_messages = report_proxy.chat_messages[stock_report_agent]
+
+    last_message = stock_report_agent_messages[-1]
+    print("Last message: ", last_message)
+
+    # check error contains in the last message
+    return bool(
+        last_message
+        and "content" in last_message
+        and not "ERROR" in last_message.get("content")
+    )
+
+
+def save_reported_strategy(
+    strategy_idea: Dict,
+    chat_res: ChatResult,
+    workspace: StrategyWorkspace,
+    custom_signal_agent_messages: List[Dict],
+    checkpoint: StrategyCheckpoint,
+):
+    save_stock_performance_data(
+        strategy_idea,
+        chat_res,
+        custom_signal_agent_messages,
+        workspace,
+        verbose_output=True,
+    )
+    # The published files are the artifacts of a finished run
+    checkpoint.record(strategy_output_dir(strategy_idea), STAGES)
+    print("Saved stock performance data for strategy: ", strategy_idea)
+
+
+def strategy_stats(
+    code_executor: Optional[CodeExecutor],
+    group_chat_manager: Optional[GroupChatManager] = None,
+) -> WorkflowStats:
+    stats = WorkflowStats()
+    validation_stats = getattr(code_executor, "stats", None)
+    if validation_stats is not None:
+        stats.code_validation.merge(validation_stats)
+    groupchat = getattr(group_chat_manager, "groupchat", None)
+    speaker_stats = getattr(getattr(groupchat, "speaker_selection_method", None), "stats", None)
+    if speaker_stats is not None:
+        stats.speaker_selection.merge(speaker_stats)
+    return stats
+
+
+def start_strategy(
+    strategy_idea: Dict, workflow_tasks: WorkFlowTasks, run_manifest: RunManifest
+) -> Tuple[Optional[StrategyCheckpoint], Optional[StrategyWorkspace]]:
+    # Each strategy gets its own workspace, agents and code execution worker,
+    # so no files or state are shared with other strategies
+    checkpoint = run_manifest.checkpoint(
+        strategy_idea, workflow_tasks.ticker, workflow_tasks.start_date, workflow_tasks.end_date
+    )
+    if checkpoint.is_finished():
+        print("Skipping strategy finished in an earlier run: ", strategy_idea)
+        return checkpoint, None
+    workspace = StrategyWorkspace(strategy_idea.get("strategy"))
+    if not checkpoint.is_done("signals"):
+        # Without intact signals nothing of an interrupted run is reused
+        workspace.clear()
+    return checkpoint, workspace
+
+
+def run_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    run_manifest: RunManifest,
+) -> Optional[WorkflowStats]:
+    checkpoint, workspace = start_strategy(strategy_idea, workflow_tasks, run_manifest)
+    if workspace is None:
+        return None
+    (
+        agents_registry,
+        group_chat_manager,
+        report_proxy,
+        stock_report_agent,
+    ) = setup_strategy_agents(workspace.work_dir)
+    code_executor = agents_registry.get(AgentName.USER_PROXY).code_executor
+    try:
+        analyze_strategy(
+            strategy_idea,
+            workflow_tasks,
+            workspace,
+            agents_registry,
+            group_chat_manager,
+            report_proxy,
+            stock_report_agent,
+            signal_code_cache,
+            signal_code_prompt,
+            checkpoint,
+        )
+    finally:
+        cleanup_strategy(workspace, code_executor, checkpoint)
+    return strategy_stats(code_executor, group_chat_manager)
+
+
+def cleanup_strategy(
+    workspace: StrategyWorkspace,
+    code_executor: Optional[CodeExecutor],
+    checkpoint: StrategyCheckpoint,
+):
+    if code_executor is not None:
+        code_executor.restart()
+    # An unfinished workspace is kept, the next run resumes from its artifacts
+    if checkpoint.is_finished():
+        workspace.remove()
+
+
+def analyze_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    workspace: StrategyWorkspace,
+    agents_registry: Dict[AgentName, ConversableAgent],
+    group_chat_manager: GroupChatManager,
+    report_proxy: ConversableAgent,
+    stock_report_agent: ConversableAgent,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    checkpoint: StrategyCheckpoint,
+):
+    work_dir = workspace.work_dir
+    code_executor = agents_registry.get(AgentName.USER_PROXY).code_executor
+    custom_signal_agent = agents_registry.get(AgentName.CUSTOM_SIGNAL_ANALYSIS_AGENT)
+
+    signal_code_cache_key = signal_code_key(strategy_idea, signal_code_prompt)
+    chat_res = run_fast_path(
+        strategy_idea,
+        workflow_tasks,
+        work_dir,
+        code_executor,
+        signal_code_cache.get(signal_code_cache_key),
+        checkpoint,
+    )
+
+    # Perform investment analysis and generate buy/sell signals
+    # Perform backtesting and provide performance metrics
+    # Create a chat with the stock report agent to generate a plot of stock prices and investment returns over time
+    if chat_res is None:
         try:
-            chat_res = user_report_proxy.initiate_chat(
+            chat_res = report_proxy.initiate_chat(
                 recipient=group_chat_manager,
                 message=genereate_strategy_analysis_request_message(
                     workflow_tasks.investment_analysis_instructions, strategy_idea
@@ -176,54 +454,383 @@ def run_workflow(workflow_tasks: WorkFlowTasks):
                 summary_method="reflection_with_llm",  # "last_msg" or "reflection_with_llm: not working"
                 summary_args={"summary_prompt": SUMMARY_PROMPT},
             )
-            print("Completed analysis for strategy: ", strategy_idea)
         except Exception as e:
             print(f"Error in chat for strategy: {strategy_idea}. {e}")
-            continue
-
-        # Workaround to handle the case when backtest_results.xlsx is not generated
-        backtest_result_file_path = os.path.join(WORK_DIR, BACKTEST_RESULTS_FILE)
-        if not os.path.exists(backtest_result_file_path):
-            stock_price_file_path = os.path.join(WORK_DIR, DATASET_STOCK)
-            stock_signals_file_path = os.path.join(WORK_DIR, DATASET_SIGNALS)
-            # Execute the backtesting strategy manually calling the function again.
-            backtest_stock_strategy(stock_price_file_path, stock_signals_file_path)
-
-        if chat_res:
-            if os.path.exists(backtest_result_file_path):
-                user_report_proxy.initiate_chat(
+            return
+
+        cache_signal_code(
+            signal_code_cache,
+            signal_code_cache_key,
+            strategy_idea,
+            custom_signal_agent,
+            group_chat_manager,
+            work_dir,
+        )
+    print("Completed analysis for strategy: ", strategy_idea)
+    checkpoint.record(work_dir, ["data"])
+    checkpoint.record(work_dir, ["signals"], note=chat_res.summary if chat_res else None)
+
+    has_backtest_results = ensure_backtest_results(work_dir)
+    checkpoint.record(work_dir, ["backtest"])
+    if chat_res:
+        if has_backtest_results:
+            reported = checkpoint.is_done("plot")
+            if not reported:
+                report_proxy.initiate_chat(
                     recipient=stock_report_agent,
                     message=workflow_tasks.stock_report_task_instructions,
                     summary_method="last_msg",
                 )
-
+                reported = report_succeeded(report_proxy, stock_report_agent)
+                checkpoint.record(work_dir, ["plot"])
+            if reported:
                 # Get the chat messages for the custom signal analysis agent.
                 # Sometimes the chat summary is empty, so we need to get the last message from the custom_signal_analysis_agent.
-                custom_signal_agent = agents_registry.get(AgentName.CUSTOM_SIGNAL_ANALYSIS_AGENT)
-                custom_signal_agent_messages = custom_signal_agent.chat_messages[group_chat_manager]
-                # Get the chat messages for the stock report agent
-                stock_report_agent_messages = user_report_proxy.chat_messages[stock_report_agent]
-
-                last_message = stock_report_agent_messages[-1]
-                print("Last message: ", last_message)
-
-                # check error contains in the last message
-                if last_message and "content" in last_message:
-                    if not "ERROR" in last_message.get("content"):
-                        save_stock_performance_data(
-                            strategy_idea, chat_res, custom_signal_agent_messages, verbose_output=True
-                        )
-                        print(
-                            "Saved stock performance data for strategy: ", strategy_idea
-                        )
-            else:
-                print(
-                    "Error: the stock performance data was not created for strategy: ",
+                save_reported_strategy(
+                    strategy_idea,
+                    chat_res,
+                    workspace,
+                    custom_signal_agent.chat_messages[group_chat_manager],
+                    checkpoint,
+                )
+        else:
+            print(
+                "Error: the stock performance data was not created for strategy: ",
+                strategy_idea,
+            )
+    else:
+        print("No chat response for strategy: ", strategy_idea)
+
+
+async def a_reflection_summary(
+    sender: ConversableAgent, recipient: ConversableAgent, summary_prompt: str
+) -> str:
+    """
+    "reflection_with_llm" summary of a finished chat, taken in a thread.
+
+    `a_initiate_chat(summary_method=...)` summarizes synchronously on the event
+    loop, and a callable `summary_method` cannot be awaited either. This is the
+    only place relying on the private `ConversableAgent._summarize_chat`
+    (autogen 0.2.x); check its signature when upgrading autogen.
+    """
+    return await asyncio.to_thread(
+        sender._summarize_chat,
+        "reflection_with_llm",
+        {"summary_prompt": summary_prompt},
+        recipient,
+    )
+
+
+async def a_analyze_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    workspace: StrategyWorkspace,
+    agents_registry: Dict[AgentName, ConversableAgent],
+    group_chat_manager: GroupChatManager,
+    report_proxy: ConversableAgent,
+    stock_report_agent: ConversableAgent,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    checkpoint: StrategyCheckpoint,
+):
+    """
+    Async variant of `analyze_strategy`. The chats use `a_initiate_chat` and the
+    blocking steps (price fetch, code execution, backtest, LLM summary) run in
+    threads, so other strategies make progress while one waits.
+    """
+    work_dir = workspace.work_dir
+    code_executor = agents_registry.get(AgentName.USER_PROXY).code_executor
+    custom_signal_agent = agents_registry.get(AgentName.CUSTOM_SIGNAL_ANALYSIS_AGENT)
+
+    signal_code_cache_key = signal_code_key(strategy_idea, signal_code_prompt)
+    chat_res = await asyncio.to_thread(
+        run_fast_path,
+        strategy_idea,
+        workflow_tasks,
+        work_dir,
+        code_executor,
+        signal_code_cache.get(signal_code_cache_key),
+        checkpoint,
+    )
+
+    if chat_res is None:
+        try:
+            chat_res = await report_proxy.a_initiate_chat(
+                recipient=group_chat_manager,
+                message=genereate_strategy_analysis_request_message(
+                    workflow_tasks.investment_analysis_instructions, strategy_idea
+                ),
+                summary_method=None,
+            )
+            chat_res.summary = await a_reflection_summary(
+                report_proxy, group_chat_manager, SUMMARY_PROMPT
+            )
+        except Exception as e:
+            print(f"Error in chat for strategy: {strategy_idea}. {e}")
+            return
+
+        cache_signal_code(
+            signal_code_cache,
+            signal_code_cache_key,
+            strategy_idea,
+            custom_signal_agent,
+            group_chat_manager,
+            work_dir,
+        )
+    print("Completed analysis for strategy: ", strategy_idea)
+    await asyncio.to_thread(checkpoint.record, work_dir, ["data"])
+    await asyncio.to_thread(
+        checkpoint.record, work_dir, ["signals"], chat_res.summary if chat_res else None
+    )
+
+    has_backtest_results = await asyncio.to_thread(ensure_backtest_results, work_dir)
+    await asyncio.to_thread(checkpoint.record, work_dir, ["backtest"])
+    if chat_res:
+        if has_backtest_results:
+            reported = checkpoint.is_done("plot")
+            if not reported:
+                await report_proxy.a_initiate_chat(
+                    recipient=stock_report_agent,
+                    message=workflow_tasks.stock_report_task_instructions,
+                    summary_method="last_msg",
+                )
+                reported = report_succeeded(report_proxy, stock_report_agent)
+                await asyncio.to_thread(checkpoint.record, work_dir, ["plot"])
+            if reported:
+                await asyncio.to_thread(
+                    save_reported_strategy,
                     strategy_idea,
+                    chat_res,
+                    workspace,
+                    custom_signal_agent.chat_messages[group_chat_manager],
+                    checkpoint,
                 )
         else:
-            print("No chat response for strategy: ", strategy_idea)
-            continue
+            print(
+                "Error: the stock performance data was not created for strategy: ",
+                strategy_idea,
+            )
+    else:
+        print("No chat response for strategy: ", strategy_idea)
+
+
+async def a_run_strategy(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    run_manifest: RunManifest,
+) -> Optional[WorkflowStats]:
+    checkpoint, workspace = await asyncio.to_thread(
+        start_strategy, strategy_idea, workflow_tasks, run_manifest
+    )
+    if workspace is None:
+        return None
+    (
+        agents_registry,
+        group_chat_manager,
+        report_proxy,
+        stock_report_agent,
+    ) = setup_strategy_agents(workspace.work_dir, async_tools=True)
+    code_executor = agents_registry.get(AgentName.USER_PROXY).code_executor
+    try:
+        await a_analyze_strategy(
+            strategy_idea,
+            workflow_tasks,
+            workspace,
+            agents_registry,
+            group_chat_manager,
+            report_proxy,
+            stock_report_agent,
+            signal_code_cache,
+            signal_code_prompt,
+            checkpoint,
+        )
+    finally:
+        await asyncio.to_thread(cleanup_strategy, workspace, code_executor, checkpoint)
+    return strategy_stats(code_executor, group_chat_manager)
+
+
+async def a_run_strategies(
+    strategy_ideas: List[Dict],
+    workflow_tasks: WorkFlowTasks,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    run_manifest: RunManifest,
+    max_concurrency: int = WORKFLOW_CONCURRENCY,
+) -> WorkflowStats:
+    # At most `max_concurrency` strategies hold a workspace and chat at a time;
+    # results are aggregated in the order the strategies finish
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_limited(strategy_idea: Dict) -> Optional[WorkflowStats]:
+        async with semaphore:
+            try:
+                return await a_run_strategy(
+                    strategy_idea,
+                    workflow_tasks,
+                    signal_code_cache,
+                    signal_code_prompt,
+                    run_manifest,
+                )
+            except Exception as e:
+                print(f"Error in strategy: {strategy_idea}. {e}")
+                return None
+
+    workflow_stats = WorkflowStats()
+    tasks = [asyncio.ensure_future(run_limited(idea)) for idea in strategy_ideas]
+    for finished, task in enumerate(asyncio.as_completed(tasks), start=1):
+        stats = await task
+        if stats is not None:
+            workflow_stats.merge(stats)
+        print(f"Finished {finished}/{len(tasks)} strategies")
+    return workflow_stats
+
+
+def run_strategy_without_llm(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    signal_code_cache: SignalCodeCache,
+    signal_code_prompt: str,
+    run_manifest: RunManifest,
+) -> Optional[WorkflowStats]:
+    # `--no-llm` only re-scores ideas with signal rules or cached signal code;
+    # the others need the group chat to write their signal code
+    cached_code = signal_code_cache.get(signal_code_key(strategy_idea, signal_code_prompt))
+    if not strategy_idea.get("rules") and not cached_code:
+        print("Skipping strategy without signal rules or cached signal code: ", strategy_idea)
+        return None
+    checkpoint, workspace = start_strategy(strategy_idea, workflow_tasks, run_manifest)
+    if workspace is None:
+        return None
+    # The worker process only starts when cached code runs
+    code_executor = UserProxyAgent._create_code_executor(workspace.work_dir)
+    try:
+        analyze_strategy_without_llm(
+            strategy_idea, workflow_tasks, workspace, code_executor, cached_code, checkpoint
+        )
+    finally:
+        cleanup_strategy(workspace, code_executor, checkpoint)
+    return strategy_stats(code_executor)
+
+
+def analyze_strategy_without_llm(
+    strategy_idea: Dict,
+    workflow_tasks: WorkFlowTasks,
+    workspace: StrategyWorkspace,
+    code_executor: CodeExecutor,
+    cached_code: Optional[str],
+    checkpoint: StrategyCheckpoint,
+):
+    """
+    Fetch data, generate signals, backtest, plot and write the summary by
+    calling the tools directly: no group chat, report chat or LLM summary.
+    """
+    work_dir = workspace.work_dir
+    chat_res = run_fast_path(
+        strategy_idea, workflow_tasks, work_dir, code_executor, cached_code, checkpoint
+    )
+    if chat_res is None:
+        print("No signals for strategy: ", strategy_idea)
+        return
+    checkpoint.record(work_dir, ["data"])
+    checkpoint.record(work_dir, ["signals"], note=chat_res.summary)
+
+    if not ensure_backtest_results(work_dir):
+        print("Error: the stock performance data was not created for strategy: ", strategy_idea)
+        return
+    checkpoint.record(work_dir, ["backtest"])
+    if not checkpoint.is_done("plot"):
+        plot_backtest_results(work_dir)
+        checkpoint.record(work_dir, ["plot"])
+    save_reported_strategy(strategy_idea, chat_res, workspace, [], checkpoint)
+
+
+# Define the agents that will be involved in the workflow
+# https://microsoft.github.io/autogen/docs/notebooks/agentchat_multi_task_async_chats#scenario-1-solve-the-tasks-with-a-series-of-chats
+def run_workflow(
+    workflow_tasks: WorkFlowTasks,
+    mode: str = WORKFLOW_MODE,
+    max_concurrency: int = WORKFLOW_CONCURRENCY,
+    no_llm: bool = False,
+):
+    if mode not in ("sequential", "async"):
+        raise ValueError(f"Unsupported workflow mode: {mode}. Use 'sequential' or 'async'.")
+
+    # Create a chat with the strategy idea agent
+    # The agent will provide stock investing ideas using technical indicators
+    strategy_idea_json_path = os.path.join(
+        os.path.dirname(__file__), WORK_DIR, STRATEGY_IDEAS
+    )
+    if no_llm and not os.path.exists(strategy_idea_json_path):
+        raise FileNotFoundError(
+            f"{strategy_idea_json_path} is required without the LLM, run the workflow once with it."
+        )
+    if not os.path.exists(strategy_idea_json_path):
+        user_report_proxy, strategy_idea_agent = setup_strategy_idea_agents()
+        user_report_proxy.initiate_chat(
+            recipient=strategy_idea_agent,
+            message=workflow_tasks.stock_idea_task_description,
+            summary_method="last_msg",
+        )
+
+    strategy_ideas = []
+    with open(strategy_idea_json_path, "r") as file:
+        strategy_ideas = json.load(file)
+
+    # Signal code that ran successfully before is reused while the idea, the
+    # signal agent prompt and the data schema are unchanged
+    signal_code_cache = SignalCodeCache()
+    signal_code_prompt = SignalAnalysisAgent._custom_signal_analysis_agent_prompt()
+    # Stages finished by earlier runs are skipped, so a restart resumes
+    run_manifest = RunManifest()
+
+    # Create a chat with the stock performance agent and stock report agent.
+    if no_llm:
+        # Direct calls take well under a second per strategy, so one at a time
+        workflow_stats = WorkflowStats()
+        for strategy_idea in strategy_ideas:
+            stats = run_strategy_without_llm(
+                strategy_idea,
+                workflow_tasks,
+                signal_code_cache,
+                signal_code_prompt,
+                run_manifest,
+            )
+            if stats is not None:
+                workflow_stats.merge(stats)
+    elif mode == "async":
+        workflow_stats = asyncio.run(
+            a_run_strategies(
+                strategy_ideas,
+                workflow_tasks,
+                signal_code_cache,
+                signal_code_prompt,
+                run_manifest,
+                max_concurrency,
+            )
+        )
+    else:
+        workflow_stats = WorkflowStats()
+        for strategy_idea in strategy_ideas:
+            stats = run_strategy(
+                strategy_idea,
+                workflow_tasks,
+                signal_code_cache,
+                signal_code_prompt,
+                run_manifest,
+            )
+            if stats is not None:
+                workflow_stats.merge(stats)
+
+    # Record what the pre-execution check of generated code and the rule-based
+    # speaker routing saved
+    print("Code validation: ", workflow_stats.code_validation)
+    with open(os.path.join(WORK_DIR, CODE_VALIDATION_STATS_FILE), "w", encoding="utf-8") as f:
+        f.write(workflow_stats.code_validation.model_dump_json(indent=4))
+    print("Speaker selection: ", workflow_stats.speaker_selection)
+    with open(os.path.join(WORK_DIR, SPEAKER_SELECTION_STATS_FILE), "w", encoding="utf-8") as f:
+        f.write(workflow_stats.speaker_selection.model_dump_json(indent=4))
 
 
 def remove_existing_files():
@@ -234,7 +841,20 @@ def remove_existing_files():
             os.remove(file_path)
 
 
-if __name__ == "__main__":
+@click.command()
+@click.option(
+    "--no-llm",
+    is_flag=True,
+    help="Re-score strategy ideas with signal rules or cached signal code by direct calls, without the agents.",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["sequential", "async"]),
+    default=WORKFLOW_MODE,
+    show_default=True,
+)
+@click.option("--concurrency", default=WORKFLOW_CONCURRENCY, show_default=True)
+def main(no_llm: bool, mode: str, concurrency: int):
     flag_for_delete_existing_files = False
     if flag_for_delete_existing_files:
         remove_existing_files()
@@ -255,9 +875,21 @@ if __name__ == "__main__":
         stock_idea_task_description="create a strategy 50 ideas for stock investing using provided technical indicators. ",
         investment_analysis_instructions=user_message,
         stock_report_task_instructions="create a plot to display stock investment returns over time",
+        ticker="MSFT",
+        start_date="1995-01-01",
+        end_date=today,
     )
 
+    if no_llm:
+        # No LLM calls to log
+        run_workflow(workflow_tasks, no_llm=True)
+        return
+
     logging_session_id = autogen.runtime_logging.start()
     print("Logging session ID: " + str(logging_session_id))
-    run_workflow(workflow_tasks)
+    run_workflow(workflow_tasks, mode=mode, max_concurrency=concurrency)
     autogen.runtime_logging.stop()
+
+
+if __name__ == "__main__":
+    main()
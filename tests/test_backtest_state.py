@@ -0,0 +1,50 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from utils.functions import backtest_stock_strategy, update_backtest_stock_strategy
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "sample", "output", "Sell in May, buy in October"
+)
+
+
+def _write_csv(df: pd.DataFrame, file_path: str) -> str:
+    df.to_csv(file_path, index=False)
+    return file_path
+
+
+@pytest.mark.parametrize("new_bars", [1, 5, 300])
+@pytest.mark.parametrize("signal_rate", [None, 0.05])
+def test_update_matches_full_backtest(tmp_path, new_bars, signal_rate):
+    prices = pd.read_csv(os.path.join(SAMPLE_DIR, "stock_data.csv"))
+    signals = pd.read_csv(os.path.join(SAMPLE_DIR, "stock_signals.csv"))
+    if signal_rate is not None:
+        rng = np.random.default_rng(0)
+        signals["BuySignal"] = rng.random(len(signals)) < signal_rate
+        signals["SellSignal"] = rng.random(len(signals)) < signal_rate
+    split = len(prices) - new_bars
+
+    full_dir, daily_dir = tmp_path / "full", tmp_path / "daily"
+    full_dir.mkdir()
+    daily_dir.mkdir()
+    full = backtest_stock_strategy(
+        _write_csv(prices, str(tmp_path / "prices.csv")),
+        _write_csv(signals, str(tmp_path / "signals.csv")),
+        work_dir=str(full_dir),
+    )
+
+    # The full run saves its state, which the daily update picks up
+    backtest_stock_strategy(
+        _write_csv(prices.iloc[:split], str(tmp_path / "old_prices.csv")),
+        _write_csv(signals.iloc[:split], str(tmp_path / "old_signals.csv")),
+        work_dir=str(daily_dir),
+    )
+    updated = update_backtest_stock_strategy(
+        _write_csv(prices.iloc[split:], str(tmp_path / "new_prices.csv")),
+        _write_csv(signals.iloc[split:], str(tmp_path / "new_signals.csv")),
+        work_dir=str(daily_dir),
+    )
+
+    assert not isinstance(updated, str), updated
+    assert updated == full
@@ -0,0 +1,240 @@
+import io
+import random
+import threading
+import time
+import pandas as pd
+import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Annotated, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import urlopen
+from .const import PRICE_DOWNLOAD_BATCH_SIZE, PRICE_DOWNLOAD_WORKERS
+from .price_store import PRICE_COLUMNS, DateRange, PriceStore, has_trading_days
+
+
+class PriceTransport:
+    """
+    Fetches daily bars for a batch of tickers over one date range in one request.
+    A ticker left out of the result failed; an empty frame means it has no bars.
+    """
+
+    def download(
+        self, tickers: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        raise NotImplementedError
+
+
+class YahooTransport(PriceTransport):
+    def download(
+        self, tickers: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        # Parallelism comes from the downloader's pool, so yfinance's own threads are off
+        data = yf.download(
+            tickers,
+            start=start_date,
+            end=end_date,
+            group_by="ticker",
+            auto_adjust=False,
+            threads=False,
+            progress=False,
+        )
+        if isinstance(data.columns, pd.MultiIndex):
+            returned = data.columns.get_level_values(0)
+            frames = {
+                ticker: data[ticker].reindex(columns=PRICE_COLUMNS).dropna(how="all")
+                for ticker in tickers
+                if ticker in returned
+            }
+        else:
+            frames = {tickers[0]: data.reindex(columns=PRICE_COLUMNS).dropna(how="all")}
+
+        # yfinance only logs failed symbols and returns all-NaN columns for them,
+        # so no bars over a range with trading days counts as a failure
+        if has_trading_days(start_date, end_date):
+            frames = {ticker: frame for ticker, frame in frames.items() if not frame.empty}
+        return frames
+
+
+class HttpCsvTransport(PriceTransport):
+    """
+    Fetches `<base_url>/prices.csv?tickers=A,B&start=...&end=...`, a long CSV with
+    a `Ticker` column plus the `stock_data.csv` columns. `serve_fixture_prices`
+    provides a local stand-in for benchmarking without network access.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def download(
+        self, tickers: List[str], start_date: str, end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        query = urlencode(
+            {"tickers": ",".join(tickers), "start": start_date, "end": end_date}
+        )
+        with urlopen(f"{self.base_url}/prices.csv?{query}", timeout=self.timeout) as r:
+            body = r.read()
+        data = pd.read_csv(io.BytesIO(body), parse_dates=["Date"])
+        frames = {
+            ticker: frame.set_index("Date")[PRICE_COLUMNS]
+            for ticker, frame in data.groupby("Ticker")
+        }
+        # The server answered for every ticker, so one without rows has no bars
+        empty = pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+        return {ticker: frames.get(ticker, empty) for ticker in tickers}
+
+
+def serve_fixture_prices(
+    frames: Dict[str, pd.DataFrame], host: str = "127.0.0.1", port: int = 0
+) -> ThreadingHTTPServer:
+    """
+    Serve `frames` (Date-indexed, per ticker) in the `HttpCsvTransport` format
+    from a background thread. Call `shutdown()` on the returned server when done.
+    """
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path != "/prices.csv":
+                self.send_error(404)
+                return
+            start, end = query["start"][0], query["end"][0]
+            parts = []
+            for ticker in query["tickers"][0].split(","):
+                frame = frames.get(ticker)
+                if frame is None:
+                    continue
+                frame = frame[(frame.index >= start) & (frame.index < end)]
+                parts.append(frame[PRICE_COLUMNS].reset_index().assign(Ticker=ticker))
+            columns = ["Ticker", "Date", *PRICE_COLUMNS]
+            body = (
+                pd.concat(parts)[columns] if parts else pd.DataFrame(columns=columns)
+            ).to_csv(index=False)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class BulkPriceDownloader:
+    """
+    Fill the local price store for a universe of tickers.
+
+    Only the date ranges each ticker is missing are requested. Tickers missing the
+    same range are grouped into batches of `batch_size`, batches run on a pool of
+    `max_workers` threads, and failed batches or tickers are retried with
+    exponential backoff. Results are written to the store from the calling thread.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PriceStore] = None,
+        transport: Optional[PriceTransport] = None,
+        batch_size: int = PRICE_DOWNLOAD_BATCH_SIZE,
+        max_workers: int = PRICE_DOWNLOAD_WORKERS,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ):
+        self.store = store or PriceStore()
+        self.transport = transport or YahooTransport()
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def _download_with_retry(
+        self, tickers: List[str], start_date: str, end_date: str
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        # Retries the tickers that failed, alone or with the whole request, and
+        # returns the frames fetched plus an error for each ticker still missing
+        frames: Dict[str, pd.DataFrame] = {}
+        pending = tickers
+        error = "no data returned"
+        for attempt in range(self.max_retries + 1):
+            try:
+                frames.update(self.transport.download(pending, start_date, end_date))
+                error = "no data returned"
+            except Exception as e:
+                error = str(e)
+            pending = [ticker for ticker in pending if ticker not in frames]
+            if not pending or attempt == self.max_retries:
+                break
+            # Jitter keeps retried batches from hitting the server in lockstep
+            delay = self.backoff_seconds * 2**attempt
+            time.sleep(delay * (1 + random.random()))
+        return frames, {ticker: error for ticker in pending}
+
+    def download(
+        self, tickers: List[str], start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        tickers = list(dict.fromkeys(tickers))
+
+        # Step 1: Group tickers by the date range they are missing
+        requests: Dict[DateRange, List[str]] = {}
+        for ticker in tickers:
+            for date_range in self.store.missing_ranges(ticker, start_date, end_date):
+                requests.setdefault(date_range, []).append(ticker)
+
+        # Step 2: Split each group into batches
+        jobs = [
+            (date_range, group[i : i + self.batch_size])
+            for date_range, group in requests.items()
+            for i in range(0, len(group), self.batch_size)
+        ]
+
+        # Step 3: Download concurrently and merge each batch into the store
+        status = {ticker: "cached" for ticker in tickers}
+        fetched_rows = {ticker: 0 for ticker in tickers}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download_with_retry, batch, *date_range): (
+                    date_range,
+                    batch,
+                )
+                for date_range, batch in jobs
+            }
+            for future in as_completed(futures):
+                date_range, batch = futures[future]
+                frames, errors = future.result()
+                for ticker, error in errors.items():
+                    status[ticker] = f"error: {error}"
+                # A successful request without bars still covers the range, so
+                # it is not requested again; failed tickers stay uncovered
+                for ticker in batch:
+                    if ticker not in frames:
+                        continue
+                    frame = frames[ticker]
+                    self.store.add(ticker, [frame], [date_range])
+                    fetched_rows[ticker] += len(frame)
+                    if not status[ticker].startswith("error"):
+                        status[ticker] = "fetched"
+
+        return pd.DataFrame(
+            {
+                "ticker": tickers,
+                "status": [status[ticker] for ticker in tickers],
+                "fetched_rows": [fetched_rows[ticker] for ticker in tickers],
+            }
+        )
+
+
+def fetch_stock_universe(
+    tickers: Annotated[str, "Comma-separated stock symbols, e.g. 'MSFT,AAPL,NVDA'"],
+    start_date: Annotated[str, "Start date in format YYYY-MM-DD"] = "2020-01-01",
+    end_date: Annotated[
+        str, "End date in format YYYY-MM-DD"
+    ] = datetime.today().strftime("%Y-%m-%d"),
+) -> str:
+    symbols = [ticker.strip().upper() for ticker in tickers.split(",") if ticker.strip()]
+    report = BulkPriceDownloader().download(symbols, start_date, end_date)
+    return report.to_string(index=False)
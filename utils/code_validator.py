@@ -0,0 +1,206 @@
+import ast
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set
+from autogen.code_utils import PYTHON_VARIANTS
+from autogen.coding import CodeBlock, CodeExecutor, CodeExtractor
+from autogen.coding.base import CommandLineCodeResult
+from .datamodels import CodeValidationStats
+
+# Modules generated signal code may import, see the SignalAnalysisAgent prompt
+ALLOWED_IMPORTS = {
+    "ta",
+    "pandas",
+    "numpy",
+    "os",
+    "math",
+    "datetime",
+    "utils.indicator_cache",
+    "utils.feature_store",
+    "utils.signal_io",
+}
+FORBIDDEN_COLUMNS = {"Close": 'use "Adj Close" as the price column'}
+OUTPUT_COLUMNS = ("BuySignal", "SellSignal", "Description")
+SIGNAL_FUNCTION = "generate_signals"
+SIGNAL_WRITER = "write_signals"
+
+# Violations that would run without an error and produce wrong signals
+SILENT_RULES = {"forbidden-column", "output-column", "signal-writer"}
+
+
+@dataclass
+class Violation:
+    rule: str
+    message: str
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        location = f"line {self.line}: " if self.line else ""
+        return f"- {location}{self.message}"
+
+
+def _string_keys(node: ast.AST) -> List[str]:
+    # df["BuySignal"] or df[["BuySignal", "SellSignal"]]
+    elements = node.elts if isinstance(node, (ast.List, ast.Tuple)) else [node]
+    return [
+        element.value
+        for element in elements
+        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+    ]
+
+
+class _SignalCodeVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.violations: List[Violation] = []
+        self.functions: Set[str] = set()
+        self.calls: Set[str] = set()
+        self.written_columns: Set[str] = set()
+
+    def _check_module(self, module: str, line: int) -> None:
+        allowed = any(
+            module == name or module.startswith(f"{name}.") for name in ALLOWED_IMPORTS
+        )
+        if not allowed:
+            self.violations.append(
+                Violation(
+                    "import",
+                    f"import of `{module}` is not allowed; allowed modules: {', '.join(sorted(ALLOWED_IMPORTS))}",
+                    line,
+                )
+            )
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._check_module(alias.name, node.lineno)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module == "utils":
+            for alias in node.names:
+                self._check_module(f"utils.{alias.name}", node.lineno)
+        else:
+            self._check_module("." * node.level + (node.module or ""), node.lineno)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.functions.add(node.name)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            self.calls.add(node.func.id)
+        elif isinstance(node.func, ast.Attribute):
+            self.calls.add(node.func.attr)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        for key in _string_keys(node.slice):
+            if key in FORBIDDEN_COLUMNS:
+                self.violations.append(
+                    Violation(
+                        "forbidden-column",
+                        f'`["{key}"]` is not allowed, {FORBIDDEN_COLUMNS[key]}',
+                        node.lineno,
+                    )
+                )
+            if isinstance(node.ctx, ast.Store):
+                self.written_columns.add(key)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr in FORBIDDEN_COLUMNS and isinstance(node.value, ast.Name):
+            self.violations.append(
+                Violation(
+                    "forbidden-column",
+                    f"`.{node.attr}` is not allowed, {FORBIDDEN_COLUMNS[node.attr]}",
+                    node.lineno,
+                )
+            )
+        self.generic_visit(node)
+
+
+def validate_signal_code(code: str) -> List[Violation]:
+    """
+    Check generated signal code against the SignalAnalysisAgent rules without
+    running it: allowed imports, no "Close" column, a `generate_signals`
+    function, the output columns and a `write_signals` call.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [Violation("syntax", f"syntax error: {e.msg}", e.lineno)]
+
+    visitor = _SignalCodeVisitor()
+    visitor.visit(tree)
+    violations = visitor.violations
+    if SIGNAL_FUNCTION not in visitor.functions:
+        violations.append(
+            Violation("signal-function", f"define a `{SIGNAL_FUNCTION}()` function")
+        )
+    elif SIGNAL_FUNCTION not in visitor.calls:
+        violations.append(
+            Violation("signal-function", f"call `{SIGNAL_FUNCTION}()` at the end of the code")
+        )
+    missing_columns = [name for name in OUTPUT_COLUMNS if name not in visitor.written_columns]
+    if missing_columns:
+        violations.append(
+            Violation(
+                "output-column",
+                f"assign the {', '.join(f'`{name}`' for name in missing_columns)} column(s) of the DataFrame",
+            )
+        )
+    if SIGNAL_WRITER not in visitor.calls:
+        violations.append(
+            Violation(
+                "signal-writer",
+                f"save the signals with `{SIGNAL_WRITER}` from `utils.signal_io`",
+            )
+        )
+    return violations
+
+
+class ValidatingCodeExecutor:
+    """
+    Code executor wrapper that validates Python blocks in-process and only
+    passes them to the wrapped executor when they follow the signal code rules.
+    Rejected blocks return exit code 1 with the list of violations, so the
+    group chat hands them straight back to `custom_signal_analysis_agent`.
+    """
+
+    def __init__(
+        self,
+        executor: CodeExecutor,
+        validator: Callable[[str], List[Violation]] = validate_signal_code,
+    ):
+        self._executor = executor
+        self._validator = validator
+        self.stats = CodeValidationStats()
+
+    @property
+    def code_extractor(self) -> CodeExtractor:
+        return self._executor.code_extractor
+
+    @property
+    def work_dir(self):
+        return self._executor.work_dir
+
+    def execute_code_blocks(self, code_blocks: List[CodeBlock]) -> CommandLineCodeResult:
+        violations: List[Violation] = []
+        for code_block in code_blocks:
+            if code_block.language in PYTHON_VARIANTS:
+                self.stats.checked_blocks += 1
+                block_violations = self._validator(code_block.code)
+                self.stats.rejected_blocks += bool(block_violations)
+                violations += block_violations
+        if not violations:
+            return self._executor.execute_code_blocks(code_blocks)
+
+        self.stats.executions_saved += 1
+        if any(violation.rule in SILENT_RULES for violation in violations):
+            self.stats.rounds_saved += 1
+        for violation in violations:
+            self.stats.violations[violation.rule] = self.stats.violations.get(violation.rule, 0) + 1
+        return CommandLineCodeResult(
+            exit_code=1,
+            output="Code rejected before execution:\n" + "\n".join(map(str, violations)),
+        )
+
+    def restart(self) -> None:
+        self._executor.restart()
@@ -4,6 +4,10 @@ from pydantic import BaseModel, field_validator
 from typing import List, Optional
 from enum import Enum
 
+# Cache directories are resolved against the repository root, not the working
+# directory: generated code runs inside per-strategy workspaces that are removed
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class AgentName(Enum):
     STOCK_ANALYSIS_AGENT = "stock_analysis_agent"
@@ -15,13 +19,42 @@ class AgentName(Enum):
 
 class Settings(BaseModel):
     work_dir: str = "_output"
-    backtest_results_file: str = "backtest_results.xlsx"
+    # "parquet", "feather" or "xlsx"; Excel is slow and best kept as an export
+    backtest_results_format: str = os.getenv("BACKTEST_RESULTS_FORMAT", "parquet")
+    backtest_results_file: str = "backtest_results"
+    backtest_results_excel_file: str = "backtest_results.xlsx"
     backtest_metrics_file: str = "backtest_metrics.txt"
+    backtest_state_file: str = "backtest_state.json"
+    code_validation_stats_file: str = "code_validation_stats.json"
+    speaker_selection_stats_file: str = "speaker_selection_stats.json"
+    # Completed stages per strategy run, see `utils/run_manifest.py`
+    run_manifest_file: str = "run_manifest.sqlite"
     dataset_stock: str = "stock_data.csv"
-    dataset_signals: str = "stock_signals.csv"
+    # Per-ticker Parquet price cache shared across runs, see `utils/price_store.py`
+    price_store_dir: str = os.path.join(REPO_ROOT, os.getenv("PRICE_STORE_DIR", "_price_store"))
+    # On-disk cache of `ta` indicator series shared by generated signal code
+    indicator_cache_dir: str = os.path.join(REPO_ROOT, os.getenv("INDICATOR_CACHE_DIR", "_indicator_cache"))
+    indicator_cache_max_mb: int = int(os.getenv("INDICATOR_CACHE_MAX_MB", 512))
+    # Last successfully executed signal code per strategy idea, see `utils/signal_code_cache.py`
+    signal_code_cache_dir: str = os.path.join(REPO_ROOT, os.getenv("SIGNAL_CODE_CACHE_DIR", "_signal_code_cache"))
+    # Tickers per request and concurrent requests for bulk universe downloads
+    price_download_batch_size: int = int(os.getenv("PRICE_DOWNLOAD_BATCH_SIZE", 20))
+    price_download_workers: int = int(os.getenv("PRICE_DOWNLOAD_WORKERS", 4))
+    # "bin" (bit-packed, see `utils/signal_io.py`) or "csv" (legacy text layout)
+    signals_format: str = os.getenv("SIGNALS_FORMAT", "bin")
+    dataset_signals: str = "stock_signals"
     strategy_ideas: str = "strategy_ideas.json"
     plot_file_name: str = "stock_plot.png"
     chat_summary_file_name: str = "chat_summary.txt"
+    # "vectorized" or "loop" (legacy row-by-row state machine, kept for diffing)
+    backtest_position_engine: str = os.getenv("BACKTEST_POSITION_ENGINE", "vectorized")
+    # "warm" (long-lived worker, see `utils/warm_executor.py`) or "local"
+    # (`LocalCommandLineCodeExecutor`, a new interpreter per code block)
+    code_executor: str = os.getenv("CODE_EXECUTOR", "warm")
+    # "sequential" (one strategy idea at a time) or "async" (up to
+    # `workflow_concurrency` strategy ideas at once, see `agent_workflow_e2e.py`)
+    workflow_mode: str = os.getenv("WORKFLOW_MODE", "sequential")
+    workflow_concurrency: int = int(os.getenv("WORKFLOW_CONCURRENCY", 4))
     llm_model_names: Optional[List[str]] = os.getenv("MODEL_NAMES")
 
     @field_validator("llm_model_names")
@@ -34,13 +67,30 @@ class Settings(BaseModel):
 settings = Settings()
 
 WORK_DIR = settings.work_dir
-BACKTEST_RESULTS_FILE = settings.backtest_results_file
+BACKTEST_RESULTS_FORMAT = settings.backtest_results_format
+BACKTEST_RESULTS_FILE = f"{settings.backtest_results_file}.{BACKTEST_RESULTS_FORMAT}"
+BACKTEST_RESULTS_EXCEL_FILE = settings.backtest_results_excel_file
 BACKTEST_METRICS_FILE = settings.backtest_metrics_file
+BACKTEST_STATE_FILE = settings.backtest_state_file
+CODE_VALIDATION_STATS_FILE = settings.code_validation_stats_file
+SPEAKER_SELECTION_STATS_FILE = settings.speaker_selection_stats_file
+RUN_MANIFEST_FILE = settings.run_manifest_file
 DATASET_STOCK = settings.dataset_stock
-DATASET_SIGNALS = settings.dataset_signals
+PRICE_STORE_DIR = settings.price_store_dir
+INDICATOR_CACHE_DIR = settings.indicator_cache_dir
+INDICATOR_CACHE_MAX_MB = settings.indicator_cache_max_mb
+SIGNAL_CODE_CACHE_DIR = settings.signal_code_cache_dir
+PRICE_DOWNLOAD_BATCH_SIZE = settings.price_download_batch_size
+PRICE_DOWNLOAD_WORKERS = settings.price_download_workers
+SIGNALS_FORMAT = settings.signals_format
+DATASET_SIGNALS = f"{settings.dataset_signals}.{SIGNALS_FORMAT}"
 STRATEGY_IDEAS = settings.strategy_ideas
 PLOT_FILE_NAME = settings.plot_file_name
 CHAT_SUMMARY_FILE_NAME = settings.chat_summary_file_name
+BACKTEST_POSITION_ENGINE = settings.backtest_position_engine
+CODE_EXECUTOR = settings.code_executor
+WORKFLOW_MODE = settings.workflow_mode
+WORKFLOW_CONCURRENCY = settings.workflow_concurrency
 MODEL_NAMES = settings.llm_model_names
 
 SUMMARY_PROMPT = dedent(
@@ -1,4 +1,6 @@
-from typing import List
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 class CustomBaseModel(BaseModel):
@@ -12,14 +14,128 @@ class SignalModel(CustomBaseModel):
     Description: str
 
 
+class SignalArrayModel(CustomBaseModel):
+    """Array-backed `SignalModel` that avoids copying signals into Python lists."""
+
+    BuySignal: np.ndarray
+    SellSignal: np.ndarray
+    Description: str
+
+
 class BacktestPerformanceMetrics(CustomBaseModel):
     cumulative_return: str
     cagr: str
     mdd: str
     sharpe_ratio: str
+    sortino_ratio: Optional[str] = None
+    calmar_ratio: Optional[str] = None
+    max_drawdown_duration: Optional[str] = None
+    exposure: Optional[str] = None
+    turnover: Optional[str] = None
+    win_rate: Optional[str] = None
+    profit_factor: Optional[str] = None
+
+
+class BacktestState(BaseModel):
+    """Running state needed to append bars to a finished backtest."""
+
+    n_bars: int
+    # Signal and position state machine
+    prev_buy_signal: int
+    prev_sell_signal: int
+    buy_occurred: bool
+    prev_position: int
+    prev_adjusted_position: float
+    # Price state for returns
+    prev_close: Optional[float]
+    last_adj_close: Optional[float]
+    # Cumulative return and drawdown state
+    start_value: float
+    cumulative_return: float
+    running_max: float
+    max_drawdown: float
+    active_running_max: Optional[float]
+    active_min_drawdown: Optional[float]
+    bars_since_peak: int
+    max_drawdown_duration: int
+    # Welford accumulators of active returns for the Sharpe ratio, and the
+    # downside sum of squares for the Sortino ratio, both at `risk_free_rate`
+    risk_free_rate: float = 0.02
+    active_count: int
+    active_mean: float
+    active_m2: float
+    active_downside_sum_squares: float
+    # Trading statistics over invested bars
+    prev_invested: bool
+    invested_count: int
+    invested_changes: int
+    win_count: int
+    gross_profit: float
+    gross_loss: float
+
+
+class CodeValidationStats(BaseModel):
+    """Counters of the pre-execution check of generated signal code."""
+
+    checked_blocks: int = 0
+    rejected_blocks: int = 0
+    # Each rejected block is one subprocess run that did not happen
+    executions_saved: int = 0
+    # Rejections of mistakes that run without error (e.g. `df["Close"]`) and
+    # would otherwise only surface in a later round, e.g. at backtesting
+    rounds_saved: int = 0
+    violations: Dict[str, int] = {}
+
+    def merge(self, other: "CodeValidationStats") -> None:
+        self.checked_blocks += other.checked_blocks
+        self.rejected_blocks += other.rejected_blocks
+        self.executions_saved += other.executions_saved
+        self.rounds_saved += other.rounds_saved
+        for rule, count in other.violations.items():
+            self.violations[rule] = self.violations.get(rule, 0) + count
+
+
+class SpeakerSelectionStats(BaseModel):
+    """Counters of the rule-based speaker routing of the analysis group chat."""
+
+    routed_turns: int = 0
+    # Turns the previous selection function left to the LLM ("auto"); each is
+    # at least one selection call, more when the reply names no single agent
+    llm_selections_saved: int = 0
+    # Prompt tokens of those selection calls, estimated at 4 characters per token
+    estimated_tokens_saved: int = 0
+    transitions: Dict[str, int] = {}
+
+    def merge(self, other: "SpeakerSelectionStats") -> None:
+        self.routed_turns += other.routed_turns
+        self.llm_selections_saved += other.llm_selections_saved
+        self.estimated_tokens_saved += other.estimated_tokens_saved
+        for transition, count in other.transitions.items():
+            self.transitions[transition] = self.transitions.get(transition, 0) + count
+
+
+class WorkflowStats(BaseModel):
+    """Savings of one workflow run, aggregated over its strategies."""
+
+    code_validation: CodeValidationStats = CodeValidationStats()
+    speaker_selection: SpeakerSelectionStats = SpeakerSelectionStats()
+
+    def merge(self, other: "WorkflowStats") -> None:
+        self.code_validation.merge(other.code_validation)
+        self.speaker_selection.merge(other.speaker_selection)
 
 
 class WorkFlowTasks(BaseModel):
     stock_idea_task_description: str
     investment_analysis_instructions: str
-    stock_report_task_instructions: str
\ No newline at end of file
+    stock_report_task_instructions: str
+    # Price data for strategy ideas with "rules", which skip the signal code chat
+    ticker: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+class PortfolioBacktestResult(CustomBaseModel):
+    ticker_metrics: pd.DataFrame
+    portfolio_metrics: Dict[str, float]
+    equity_curves: pd.DataFrame
+    portfolio_equity: pd.Series
@@ -0,0 +1,384 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import ta
+from typing import Callable, Dict, List, Tuple
+from .const import PRICE_STORE_DIR
+from .price_store import PRICE_COLUMNS, read_price_csv
+
+# A builder receives a price frame and returns named feature columns
+FeatureBuilder = Callable[[pd.DataFrame], Dict[str, pd.Series]]
+
+
+def _close(df: pd.DataFrame) -> pd.Series:
+    # Signals are generated on "Adj Close" only, see the SignalAnalysisAgent prompt
+    return df["Adj Close"]
+
+
+def _negative_volume_index(close: pd.Series, volume: pd.Series) -> pd.Series:
+    # Vectorized `ta.volume.NegativeVolumeIndexIndicator` (a Python loop in ta)
+    factor = np.where(volume.shift(1) > volume, 1.0 + close.pct_change(), 1.0)
+    factor[0] = 1.0
+    return pd.Series(1000 * np.cumprod(factor), index=close.index, name="nvi")
+
+
+def _money_flow_index(
+    high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series, window: int = 14
+) -> pd.Series:
+    # Vectorized `ta.volume.MFIIndicator` (rolling.apply in ta)
+    typical_price = (high + low + close) / 3.0
+    up_down = np.sign(typical_price - typical_price.shift(1)).fillna(0)
+    money_flow = typical_price * volume * up_down
+    positive = money_flow.clip(lower=0).rolling(window, min_periods=window).sum()
+    negative = (-money_flow.clip(upper=0)).rolling(window, min_periods=window).sum()
+    return pd.Series(100 - 100 / (1 + positive / negative), name="mfi")
+
+
+def _average_true_range(
+    high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14
+) -> pd.Series:
+    # Vectorized `ta.volatility.AverageTrueRange`: Wilder smoothing is an EWM with
+    # alpha = 1 / window seeded with the mean of the first `window` true ranges
+    prev_close = close.shift(1)
+    true_range = pd.concat(
+        [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+    ).max(axis=1)
+    atr = np.zeros(len(close))
+    if len(close) >= window:
+        seeded = np.concatenate(
+            [[true_range.iloc[:window].mean()], true_range.to_numpy()[window:]]
+        )
+        atr[window - 1 :] = (
+            pd.Series(seeded).ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+        )
+    return pd.Series(atr, index=close.index, name="atr")
+
+
+def _commodity_channel_index(
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    window: int = 20,
+    constant: float = 0.015,
+) -> pd.Series:
+    # Vectorized `ta.trend.CCIIndicator`; the mean absolute deviation uses
+    # sliding windows instead of rolling.apply
+    typical_price = (high + low + close) / 3.0
+    mad = np.full(len(typical_price), np.nan)
+    if len(typical_price) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(
+            typical_price.to_numpy(), window
+        )
+        mad[window - 1 :] = np.abs(
+            windows - windows.mean(axis=1, keepdims=True)
+        ).mean(axis=1)
+    mean = typical_price.rolling(window, min_periods=window).mean()
+    return pd.Series((typical_price - mean) / (constant * mad), name="cci")
+
+
+def _volume_features(df: pd.DataFrame) -> Dict[str, FeatureBuilder]:
+    high, low, close, volume = df["High"], df["Low"], _close(df), df["Volume"]
+    obv = lambda: ta.volume.OnBalanceVolumeIndicator(close, volume).on_balance_volume()
+    return {
+        "ADI": lambda: {
+            "volume_adi": ta.volume.AccDistIndexIndicator(
+                high, low, close, volume
+            ).acc_dist_index()
+        },
+        "OBV": lambda: {"volume_obv": obv()},
+        "OBV mean": lambda: {"volume_obvm": obv().rolling(10, min_periods=10).mean()},
+        "CMF": lambda: {
+            "volume_cmf": ta.volume.ChaikinMoneyFlowIndicator(
+                high, low, close, volume
+            ).chaikin_money_flow()
+        },
+        "FI": lambda: {
+            "volume_fi": ta.volume.ForceIndexIndicator(close, volume).force_index()
+        },
+        "EoM": lambda: (
+            lambda eom: {
+                "volume_em": eom.ease_of_movement(),
+                "volume_sma_em": eom.sma_ease_of_movement(),
+            }
+        )(ta.volume.EaseOfMovementIndicator(high, low, volume)),
+        "VPT": lambda: {
+            "volume_vpt": ta.volume.VolumePriceTrendIndicator(
+                close, volume
+            ).volume_price_trend()
+        },
+        "NVI": lambda: {"volume_nvi": _negative_volume_index(close, volume)},
+        "MFI": lambda: {
+            "volume_mfi": _money_flow_index(high, low, close, volume)
+        },
+    }
+
+
+def _volatility_features(df: pd.DataFrame) -> Dict[str, FeatureBuilder]:
+    high, low, close = df["High"], df["Low"], _close(df)
+    return {
+        "ATR": lambda: {"volatility_atr": _average_true_range(high, low, close)},
+        "BB": lambda: (
+            lambda bb: {
+                "volatility_bbm": bb.bollinger_mavg(),
+                "volatility_bbh": bb.bollinger_hband(),
+                "volatility_bbl": bb.bollinger_lband(),
+                "volatility_bbw": bb.bollinger_wband(),
+                "volatility_bbp": bb.bollinger_pband(),
+                "volatility_bbhi": bb.bollinger_hband_indicator(),
+                "volatility_bbli": bb.bollinger_lband_indicator(),
+            }
+        )(ta.volatility.BollingerBands(close)),
+        "KC": lambda: (
+            lambda kc: {
+                "volatility_kcc": kc.keltner_channel_mband(),
+                "volatility_kch": kc.keltner_channel_hband(),
+                "volatility_kcl": kc.keltner_channel_lband(),
+                "volatility_kcw": kc.keltner_channel_wband(),
+                "volatility_kcp": kc.keltner_channel_pband(),
+                "volatility_kchi": kc.keltner_channel_hband_indicator(),
+                "volatility_kcli": kc.keltner_channel_lband_indicator(),
+            }
+        )(ta.volatility.KeltnerChannel(high, low, close)),
+        "DC": lambda: (
+            lambda dc: {
+                "volatility_dcl": dc.donchian_channel_lband(),
+                "volatility_dch": dc.donchian_channel_hband(),
+                "volatility_dcm": dc.donchian_channel_mband(),
+                "volatility_dcw": dc.donchian_channel_wband(),
+                "volatility_dcp": dc.donchian_channel_pband(),
+            }
+        )(ta.volatility.DonchianChannel(high, low, close)),
+    }
+
+
+def _trend_features(df: pd.DataFrame) -> Dict[str, FeatureBuilder]:
+    high, low, close = df["High"], df["Low"], _close(df)
+    return {
+        "MACD": lambda: (
+            lambda macd: {
+                "trend_macd": macd.macd(),
+                "trend_macd_signal": macd.macd_signal(),
+                "trend_macd_diff": macd.macd_diff(),
+            }
+        )(ta.trend.MACD(close)),
+        "ADX": lambda: (
+            lambda adx: {
+                "trend_adx": adx.adx(),
+                "trend_adx_pos": adx.adx_pos(),
+                "trend_adx_neg": adx.adx_neg(),
+            }
+        )(ta.trend.ADXIndicator(high, low, close)),
+        "VI": lambda: (
+            lambda vi: {
+                "trend_vortex_ind_pos": vi.vortex_indicator_pos(),
+                "trend_vortex_ind_neg": vi.vortex_indicator_neg(),
+                "trend_vortex_ind_diff": vi.vortex_indicator_diff(),
+            }
+        )(ta.trend.VortexIndicator(high, low, close)),
+        "TRIX": lambda: {"trend_trix": ta.trend.TRIXIndicator(close).trix()},
+        "MI": lambda: {"trend_mass_index": ta.trend.MassIndex(high, low).mass_index()},
+        "CCI": lambda: {"trend_cci": _commodity_channel_index(high, low, close)},
+        "DPO": lambda: {"trend_dpo": ta.trend.DPOIndicator(close).dpo()},
+        "KST": lambda: (
+            lambda kst: {
+                "trend_kst": kst.kst(),
+                "trend_kst_sig": kst.kst_sig(),
+                "trend_kst_diff": kst.kst_diff(),
+            }
+        )(ta.trend.KSTIndicator(close)),
+        "Ichimoku": lambda: (
+            lambda ichimoku: {
+                "trend_ichimoku_conv": ichimoku.ichimoku_conversion_line(),
+                "trend_ichimoku_base": ichimoku.ichimoku_base_line(),
+                "trend_ichimoku_a": ichimoku.ichimoku_a(),
+                "trend_ichimoku_b": ichimoku.ichimoku_b(),
+            }
+        )(ta.trend.IchimokuIndicator(high, low)),
+    }
+
+
+def _momentum_features(df: pd.DataFrame) -> Dict[str, FeatureBuilder]:
+    high, low, close = df["High"], df["Low"], _close(df)
+    return {
+        "RSI": lambda: {"momentum_rsi": ta.momentum.RSIIndicator(close).rsi()},
+        "TSI": lambda: {"momentum_tsi": ta.momentum.TSIIndicator(close).tsi()},
+        "UO": lambda: {
+            "momentum_uo": ta.momentum.UltimateOscillator(
+                high, low, close
+            ).ultimate_oscillator()
+        },
+        "SR": lambda: (
+            lambda sr: {
+                "momentum_stoch": sr.stoch(),
+                "momentum_stoch_signal": sr.stoch_signal(),
+            }
+        )(ta.momentum.StochasticOscillator(high, low, close)),
+        "WR": lambda: {
+            "momentum_wr": ta.momentum.WilliamsRIndicator(high, low, close).williams_r()
+        },
+        "AO": lambda: {
+            "momentum_ao": ta.momentum.AwesomeOscillatorIndicator(
+                high, low
+            ).awesome_oscillator()
+        },
+    }
+
+
+def _other_features(df: pd.DataFrame) -> Dict[str, FeatureBuilder]:
+    close = _close(df)
+    return {
+        "DR": lambda: {"others_dr": ta.others.daily_return(close)},
+        "CR": lambda: {"others_cr": ta.others.cumulative_return(close)},
+    }
+
+
+# The indicators listed in the StrategyIdeaAgent prompt, with ta's default
+# parameters and ta's `add_all_ta_features` column names
+FEATURE_CATALOGUE: Dict[str, Callable[[pd.DataFrame], Dict[str, FeatureBuilder]]] = {
+    "volume": _volume_features,
+    "volatility": _volatility_features,
+    "trend": _trend_features,
+    "momentum": _momentum_features,
+    "others": _other_features,
+}
+
+
+def price_data_version(df: pd.DataFrame) -> str:
+    hashes = pd.util.hash_pandas_object(
+        df[PRICE_COLUMNS].reset_index(drop=True), index=False
+    ).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:16]
+
+
+def build_features(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute every catalogue indicator on `df` and return the feature matrix
+    (same index as `df`) with a report of build time and memory per indicator.
+    """
+    columns: Dict[str, pd.Series] = {}
+    report: List[Dict[str, object]] = []
+    for category, builders in FEATURE_CATALOGUE.items():
+        for indicator, build in builders(df).items():
+            start = time.perf_counter()
+            features = build()
+            seconds = time.perf_counter() - start
+            for name, values in features.items():
+                columns[name] = pd.Series(values, index=df.index, dtype="float64")
+            report.append(
+                {
+                    "category": category,
+                    "indicator": indicator,
+                    "columns": ", ".join(features),
+                    "seconds": seconds,
+                    "bytes": sum(columns[name].memory_usage(index=False) for name in features),
+                }
+            )
+    return pd.DataFrame(columns, index=df.index), pd.DataFrame(report)
+
+
+def feature_columns() -> List[str]:
+    """Names of the catalogue feature columns, e.g. for agent prompts."""
+    index = pd.date_range("2000-01-03", periods=64, freq="B", name="Date")
+    close = pd.Series(np.linspace(10.0, 20.0, len(index)), index=index)
+    df = pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": np.arange(1, len(index) + 1) * 1000,
+        }
+    )
+    with np.errstate(all="ignore"):
+        return list(build_features(df)[0].columns)
+
+
+# Bump when a catalogue builder changes, so feature files are rebuilt
+FEATURE_SET_VERSION = "1"
+
+# Concurrent strategies build a missing feature file one at a time
+_build_lock = threading.Lock()
+
+
+class FeatureStore:
+    """
+    Feature matrices persisted next to the price store, one Parquet file per
+    price data content hash and feature set version, so a strategy only looks
+    columns up. Files of the current feature set version are never removed, so
+    they can be read without holding the build lock.
+    """
+
+    def __init__(self, store_dir: str = PRICE_STORE_DIR):
+        self.feature_dir = os.path.join(store_dir, "features")
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _path(self, data_version: str, extension: str, feature_version: str = FEATURE_SET_VERSION) -> str:
+        return os.path.join(self.feature_dir, f"{data_version}-v{feature_version}.{extension}")
+
+    def _prune_stale_versions(self) -> None:
+        # Only files of other feature set versions, other price data stays usable
+        current = f"-v{FEATURE_SET_VERSION}."
+        for path in glob.glob(os.path.join(self.feature_dir, "*-v*.*")):
+            if current not in os.path.basename(path) and not path.endswith(".tmp"):
+                os.remove(path)
+
+    def build(self, df: pd.DataFrame) -> pd.DataFrame:
+        version = price_data_version(df)
+        features, report = build_features(df)
+        os.makedirs(self.feature_dir, exist_ok=True)
+        self._prune_stale_versions()
+        # Write then rename, so readers never see a partial file
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        report_path = self._path(version, "report.json")
+        report.to_json(f"{report_path}.{suffix}", orient="records", indent=2)
+        os.replace(f"{report_path}.{suffix}", report_path)
+        path = self._path(version, "parquet")
+        features.to_parquet(f"{path}.{suffix}")
+        os.replace(f"{path}.{suffix}", path)
+        self._frames[version] = features
+        return report
+
+    def get(self, df: pd.DataFrame) -> pd.DataFrame:
+        version = price_data_version(df)
+        if version in self._frames:
+            return self._frames[version]
+        path = self._path(version, "parquet")
+        if not os.path.exists(path):
+            with _build_lock:
+                if not os.path.exists(path):
+                    self.build(df)
+                    return self._frames[version]
+        features = pd.read_parquet(path)
+        features.index = df.index
+        self._frames[version] = features
+        return features
+
+    def report(self, df: pd.DataFrame) -> pd.DataFrame:
+        path = self._path(price_data_version(df), "report.json")
+        if not os.path.exists(path):
+            with _build_lock:
+                if not os.path.exists(path):
+                    return self.build(df)
+        with open(path, "r", encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f))
+
+
+def load_features(stock_price_file_path: str) -> pd.DataFrame:
+    """
+    Feature matrix for a `stock_data.csv` style file, built on first use. Rows
+    line up with `pd.read_csv(stock_price_file_path)`, so generated signal code
+    can do `df = df.join(load_features(INPUT_FILE))` or index columns directly.
+    """
+    prices = read_price_csv(stock_price_file_path)
+    features = FeatureStore().get(prices)
+    # `read_price_csv` sorts by date, so restore the file's row order if needed
+    dates = pd.read_csv(stock_price_file_path, usecols=["Date"], parse_dates=["Date"])["Date"]
+    if not dates.is_monotonic_increasing:
+        features = features.reindex(dates)
+    return features.reset_index(drop=True)
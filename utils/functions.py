@@ -1,60 +1,174 @@
 from enum import Enum, IntEnum
 import os
+import threading
 import numpy as np
-import yfinance as yf
 import pandas as pd
-from typing import Any, Dict, Annotated
+from typing import Any, Dict, Annotated, List, Literal, Optional, Tuple, Union
 from datetime import datetime
-from .const import WORK_DIR, BACKTEST_RESULTS_FILE, BACKTEST_METRICS_FILE, DATASET_STOCK
-from .datamodels import SignalModel, BacktestPerformanceMetrics
+from .const import (
+    WORK_DIR,
+    BACKTEST_RESULTS_FILE,
+    BACKTEST_RESULTS_EXCEL_FILE,
+    BACKTEST_METRICS_FILE,
+    BACKTEST_POSITION_ENGINE,
+    BACKTEST_STATE_FILE,
+    DATASET_STOCK,
+)
+from .datamodels import (
+    SignalModel,
+    SignalArrayModel,
+    BacktestPerformanceMetrics,
+    BacktestState,
+)
+from .price_store import PriceStore, read_price_csv
+from .shared_data import publish_price_arrays
+from .signal_io import read_signals
+
+
+def save_backtest_results(df: pd.DataFrame, file_path: str) -> str:
+    # The format follows the file extension, see `BACKTEST_RESULTS_FORMAT`
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet":
+        df.to_parquet(file_path, index=False)
+    elif extension == ".feather":
+        df.reset_index(drop=True).to_feather(file_path)
+    elif extension == ".xlsx":
+        df.to_excel(file_path, index=False)
+    else:
+        raise ValueError(
+            f"Unsupported backtest results format: {extension}. Use parquet, feather or xlsx."
+        )
+    return f'Backtest results saved to "{file_path}"'
+
+
+def load_backtest_results(file_path: str) -> pd.DataFrame:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet":
+        return pd.read_parquet(file_path)
+    elif extension == ".feather":
+        return pd.read_feather(file_path)
+    elif extension == ".xlsx":
+        return pd.read_excel(file_path)
+    raise ValueError(
+        f"Unsupported backtest results format: {extension}. Use parquet, feather or xlsx."
+    )
+
+
+def export_backtest_results_to_excel(
+    results_file_path: Optional[str] = None, excel_file_path: Optional[str] = None
+) -> str:
+    # On-demand Excel export of the backtest results for manual inspection
+    results_file_path = results_file_path or os.path.join(WORK_DIR, BACKTEST_RESULTS_FILE)
+    excel_file_path = excel_file_path or os.path.join(
+        os.path.dirname(results_file_path), BACKTEST_RESULTS_EXCEL_FILE
+    )
+    # With `BACKTEST_RESULTS_FORMAT=xlsx` both names resolve to the results file
+    if os.path.abspath(excel_file_path) == os.path.abspath(results_file_path):
+        return f'Backtest results are already in Excel format in "{results_file_path}"'
+    df = load_backtest_results(results_file_path)
+    df.to_excel(excel_file_path, index=False)
+    return f'Backtest results exported to "{excel_file_path}"'
 
 
 class StockDataHandler:
     def __init__(
-        self, ticker: str, start_date: str, end_date: str, data_file_path: str
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        data_file_path: str,
+        store: Optional[PriceStore] = None,
     ):
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
         self.data_file_path = data_file_path
-        self.data = None
+        self.store = store
+        self.data: Optional[pd.DataFrame] = None
+
+    # The *_frame methods keep the data as a DataFrame end to end; the dict
+    # returning methods are thin wrappers kept for the LLM tool signatures.
+    def fetch_frame(self) -> pd.DataFrame:
+        # Served from the local price store, which only downloads missing ranges
+        if self.store is None:
+            self.store = PriceStore()
+        self.data = self.store.get(self.ticker, self.start_date, self.end_date)
+        return self.data
 
     def fetch_data(self) -> Dict[str, Any]:
-        self.data = yf.download(self.ticker, start=self.start_date, end=self.end_date)
-        return self.data.to_dict()
+        return self.fetch_frame().to_dict()
 
     def save_data_to_csv(self) -> str:
-        df = pd.DataFrame.from_dict(self.data)
+        if self.data.empty:
+            raise ValueError(
+                f"No price data for {self.ticker} between {self.start_date} and {self.end_date}."
+            )
+        df = self.data.copy()
         df["Date"] = df.index
-        df.to_csv(self.data_file_path, index=False)
+        # Write next to the target and swap it in, so readers never see a partial file
+        tmp_file_path = f"{self.data_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_csv(tmp_file_path, index=False)
+        os.replace(tmp_file_path, self.data_file_path)
         return f'Data saved to "{self.data_file_path}"'
 
+    def load_frame_from_csv(self) -> pd.DataFrame:
+        self.data = pd.read_csv(self.data_file_path)
+        return self.data
+
     def load_data_from_csv(self) -> Dict[str, Any]:
-        df = pd.read_csv(self.data_file_path)
-        self.data = df
-        return df.to_dict()
+        return self.load_frame_from_csv().to_dict()
+
+    def load_prices_from_csv(self) -> pd.DataFrame:
+        # Typed, validated price ingest; `load_frame_from_csv` is for other files
+        self.data = read_price_csv(self.data_file_path)
+        return self.data
+
+    def get_frame(self) -> pd.DataFrame:
+        # An existing file is only trusted when no ticker is given; otherwise
+        # the store decides what to fetch and the file is rewritten for the request
+        if not self.ticker and os.path.exists(self.data_file_path):
+            return self.load_prices_from_csv()
+        self.fetch_frame()
+        self.save_data_to_csv()
+        return self.data
 
     def get_data(self) -> Dict[str, Any]:
-        if os.path.exists(self.data_file_path):
-            return self.load_data_from_csv()
-        else:
-            self.fetch_data()
-            self.save_data_to_csv()
-            return self.data.to_dict()
+        return self.get_frame().to_dict()
+
+    def publish_shared_arrays(self, directory: Optional[str] = None) -> str:
+        # Memory-mapped copy of the columns next to the CSV (`stock_data.shared/`),
+        # which parallel workers attach to with `load_price_frame` instead of parsing
+        if self.data is None:
+            self.load_prices_from_csv()
+        directory = directory or f"{os.path.splitext(self.data_file_path)[0]}.shared"
+        return publish_price_arrays(self.data, directory)
 
 
 class SignalGenerator:
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Union[Dict[str, Any], pd.DataFrame]):
         self.data = data
 
+    def _frame(self) -> pd.DataFrame:
+        if isinstance(self.data, pd.DataFrame):
+            return self.data
+        return pd.DataFrame.from_dict(self.data)
+
     def generate_signals_model(self) -> SignalModel:
-        df = pd.DataFrame.from_dict(self.data)
+        df = self._frame()
         return SignalModel(
             BuySignal=df["BuySignal"].tolist(),
             SellSignal=df["SellSignal"].tolist(),
             Description=df["Description"].iloc[0],
         )
 
+    def generate_signal_arrays(self) -> SignalArrayModel:
+        df = self._frame()
+        return SignalArrayModel(
+            BuySignal=df["BuySignal"].to_numpy(),
+            SellSignal=df["SellSignal"].to_numpy(),
+            Description=df["Description"].iloc[0],
+        )
+
 
 class PerformanceMetricsCalculator:
     @staticmethod
@@ -91,6 +205,139 @@ class PerformanceMetricsCalculator:
             raise ValueError(f"Unsupported period: {period}. Use 'daily' or 'yearly'.")
         return sharpe_ratio
 
+    @staticmethod
+    def calculate_cumulative_returns(adjusted_returns: np.ndarray) -> np.ndarray:
+        cumulative_returns = np.cumprod(1 + adjusted_returns, axis=0)
+        cumulative_returns[np.isnan(cumulative_returns)] = 1
+        return cumulative_returns
+
+    @staticmethod
+    def calculate_risk_statistics(
+        adjusted_returns: np.ndarray,
+        adjusted_position: np.ndarray,
+        cumulative_returns: Optional[np.ndarray] = None,
+        cumulative_max: Optional[np.ndarray] = None,
+        risk_free_rate: float = 0.02,
+        n_bars: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fused kernel for every backtest statistic.
+
+        Works column-wise on (n_bars x n_strategies) arrays, or on a single
+        series in which case plain floats are returned. The cumulative return
+        curve and its running maximum are computed once (or taken from the
+        caller) and shared by all drawdown statistics; active/invested bars are
+        handled with masks rather than boolean-indexed copies. MDD and Sharpe
+        keep the definitions of `calculate_mdd` and `calculate_sharpe_ratio`
+        (daily), and `n_bars` overrides the history length per column.
+        """
+        single_series = np.ndim(adjusted_returns) == 1
+        returns = np.asarray(adjusted_returns, dtype=np.float64).reshape(
+            len(adjusted_returns), -1
+        )
+        positions = np.asarray(adjusted_position).reshape(returns.shape)
+        if cumulative_returns is None:
+            cumulative_returns = PerformanceMetricsCalculator.calculate_cumulative_returns(
+                returns
+            )
+        cumulative_returns = np.asarray(cumulative_returns).reshape(returns.shape)
+        if cumulative_max is None:
+            cumulative_max = np.maximum.accumulate(cumulative_returns, axis=0)
+        cumulative_max = np.asarray(cumulative_max).reshape(returns.shape)
+
+        bar_count = len(returns) if n_bars is None else np.asarray(n_bars)
+        periods = bar_count / 252
+        daily_risk_free_rate = risk_free_rate / 252
+        row_index = np.arange(len(returns)).reshape(-1, 1)
+
+        # Bars counted by the Sharpe ratio, and bars whose drawdown counts for
+        # MDD (`positions.shift(1) != 0`: the first bar is always included)
+        active = positions != 0
+        mdd_active = np.ones(positions.shape, dtype=bool)
+        mdd_active[1:] = active[:-1]
+        # Bars where the strategy is in the market (including the sell-at-open bar)
+        invested = (
+            (positions == Position.BUY)
+            | (positions == Position.HOLD)
+            | (positions == Position.SELL)
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            start_value, end_value = cumulative_returns[0], cumulative_returns[-1]
+            cumulative_return = end_value / start_value - 1
+            cagr = PerformanceMetricsCalculator.calculate_cagr(
+                start_value, end_value, periods
+            )
+
+            # Drawdowns
+            active_max = np.maximum.accumulate(
+                np.where(mdd_active, cumulative_returns, -np.inf), axis=0
+            )
+            drawdown = np.where(
+                mdd_active, cumulative_returns / active_max - 1, np.inf
+            )
+            mdd = np.fmin.reduce(drawdown, axis=0)
+            mdd = np.where(np.isinf(mdd), np.nan, mdd)
+            last_peak = np.maximum.accumulate(
+                np.where(cumulative_returns >= cumulative_max, row_index, 0), axis=0
+            )
+            max_drawdown_duration = (row_index - last_peak).max(axis=0)
+
+            # Sharpe and Sortino over active bars
+            active_count = active.sum(axis=0)
+            active_returns = returns * active
+            mean = active_returns.sum(axis=0) / active_count
+            variance = (((returns - mean) * active) ** 2).sum(axis=0) / (
+                active_count - 1
+            )
+            std_dev = np.sqrt(variance)
+            sharpe_ratio = np.where(
+                (active_count == 0) | (std_dev == 0),
+                0,
+                (mean - daily_risk_free_rate) / std_dev,
+            )
+            downside = np.minimum(returns - daily_risk_free_rate, 0) * active
+            downside_dev = np.sqrt((downside**2).sum(axis=0) / active_count)
+            sortino_ratio = np.where(
+                (active_count == 0) | (downside_dev == 0),
+                0,
+                (mean - daily_risk_free_rate) / downside_dev,
+            )
+            calmar_ratio = np.where(mdd < 0, cagr / np.abs(mdd), 0)
+
+            # Trading statistics over invested bars
+            invested_count = invested.sum(axis=0)
+            exposure = invested_count / bar_count
+            turnover = (invested[1:] != invested[:-1]).sum(axis=0) / periods
+            invested_returns = returns * invested
+            win_rate = np.where(
+                invested_count > 0, (invested_returns > 0).sum(axis=0) / invested_count, 0
+            )
+            gross_profit = np.maximum(invested_returns, 0).sum(axis=0)
+            gross_loss = -np.minimum(invested_returns, 0).sum(axis=0)
+            profit_factor = np.where(
+                gross_loss > 0,
+                gross_profit / gross_loss,
+                np.where(gross_profit > 0, np.inf, 0),
+            )
+
+        statistics = {
+            "cumulative_return": cumulative_return,
+            "cagr": cagr,
+            "mdd": mdd,
+            "sharpe_ratio": sharpe_ratio,
+            "sortino_ratio": sortino_ratio,
+            "calmar_ratio": calmar_ratio,
+            "max_drawdown_duration": max_drawdown_duration,
+            "exposure": exposure,
+            "turnover": turnover,
+            "win_rate": win_rate,
+            "profit_factor": profit_factor,
+        }
+        if single_series:
+            return {name: float(values[0]) for name, values in statistics.items()}
+        return statistics
+
 
 # Define the Position Enum
 class Position(IntEnum):
@@ -100,41 +347,163 @@ class Position(IntEnum):
     NO_HOLD = 4
 
 
-class Backtester:
-    def __init__(self, data: Dict[str, Any], signals: SignalModel):
-        self.data = pd.DataFrame.from_dict(data)
-        self.signals = signals
-        self.results = None
+# The position kernels below work along axis 0 (bars), so they accept either a
+# single signal vector or an (n_bars x n_strategies) signal matrix.
+def _shift_rows(values: np.ndarray, fill_value: Any) -> np.ndarray:
+    shifted = np.empty(values.shape, dtype=np.result_type(values, fill_value))
+    shifted[:1] = fill_value
+    shifted[1:] = values[:-1]
+    return shifted
 
-    def backtest_strategy_perf(self) -> BacktestPerformanceMetrics:
-        # Step 1: Initialize Buy and Sell Signals
-        self.data["BuySignal"] = pd.Series(self.signals.BuySignal).astype(int)
-        self.data["SellSignal"] = pd.Series(self.signals.SellSignal).astype(int)
 
-        # Step 2: Define HoldSignal
-        # If buy signal, hold, if sell signal, no hold
-        # If same buy signal as previous day, hold
-        # If same sell signal as previous day, no hold
-        # If no buy or sell signal, hold
-        self.data["HoldSignal"] = np.where(
-            (self.data["BuySignal"] == 0) & (self.data["SellSignal"] == 0),
+def compute_hold_signal(buy_signal: np.ndarray, sell_signal: np.ndarray) -> np.ndarray:
+    # If buy signal, hold, if sell signal, no hold
+    # If same buy signal as previous day, hold
+    # If same sell signal as previous day, no hold
+    # If no buy or sell signal, hold
+    return np.where(
+        (buy_signal == 0) & (sell_signal == 0),
+        Position.HOLD,
+        np.where(
+            (buy_signal == 1) & (_shift_rows(buy_signal, 0) == 1),
             Position.HOLD,
             np.where(
-                (self.data["BuySignal"] == 1)
-                & (self.data["BuySignal"].shift(1, fill_value=0) == 1),
-                Position.HOLD,
-                np.where(
-                    (self.data["SellSignal"] == 1)
-                    & (self.data["SellSignal"].shift(1, fill_value=0) == 1),
-                    Position.NO_HOLD,
-                    np.where(
-                        self.data["BuySignal"] == 1, Position.HOLD, Position.NO_HOLD
-                    ),
-                ),
+                (sell_signal == 1) & (_shift_rows(sell_signal, 0) == 1),
+                Position.NO_HOLD,
+                np.where(buy_signal == 1, Position.HOLD, Position.NO_HOLD),
             ),
-        )
+        ),
+    )
+
+
+def compute_valid_sell_hold(
+    buy_signal: np.ndarray, sell_signal: np.ndarray, hold_signal: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scan-based equivalent of the legacy `ValidSell`/`ValidHold` loop.
+
+    The loop carries a single `buy_occurred` flag which is set by a buy and
+    cleared by a valid sell. At any row the flag therefore equals "the last
+    buy/sell event strictly before this row was a buy", which can be found with
+    a running maximum over the event indices instead of a Python loop.
+    """
+    buy = np.asarray(buy_signal) == 1
+    # A buy on the same row wins over a sell (the loop `continue`s on buys)
+    sell = (np.asarray(sell_signal) == 1) & ~buy
+    hold = np.asarray(hold_signal) == Position.HOLD
+
+    row_index = np.arange(len(buy)).reshape((-1,) + (1,) * (buy.ndim - 1))
+    last_event = np.maximum.accumulate(np.where(buy | sell, row_index, -1), axis=0)
+    buy_occurred_after = (last_event >= 0) & np.take_along_axis(
+        buy, np.maximum(last_event, 0), axis=0
+    )
+    buy_occurred = _shift_rows(buy_occurred_after, False)
 
-        # Step 3: Initialize columns for valid sells and positions
+    valid_sell = sell & buy_occurred
+    valid_hold = hold & ~buy & buy_occurred
+    return valid_sell, valid_hold
+
+
+def compute_position(
+    buy_signal: np.ndarray,
+    sell_signal: np.ndarray,
+    hold_signal: np.ndarray,
+    valid_sell: np.ndarray,
+    valid_hold: np.ndarray,
+) -> np.ndarray:
+    return np.where(
+        (hold_signal == Position.HOLD) & (valid_hold == True),
+        Position.HOLD,
+        np.where(
+            buy_signal == 1,
+            Position.BUY,
+            np.where(
+                (sell_signal == 1) & (valid_sell == True),
+                Position.SELL,
+                Position.NO_HOLD,
+            ),
+        ),
+    )
+
+
+def compute_adjusted_returns(
+    adjusted_position: np.ndarray, returns: np.ndarray, open_returns: np.ndarray
+) -> np.ndarray:
+    # A single price series is broadcast over the strategy columns if any
+    if adjusted_position.ndim == 2 and returns.ndim == 1:
+        returns = returns.reshape(-1, 1)
+        open_returns = open_returns.reshape(-1, 1)
+    return np.where(
+        adjusted_position == Position.NO_HOLD,
+        0,
+        np.where(
+            adjusted_position == Position.SELL,
+            # When a signal to sell is generated, sell at the open price
+            # Therefore, returns are calculated as (Open / Close(PrevDay)) - 1
+            open_returns,
+            np.where(
+                (adjusted_position == Position.BUY)
+                | (adjusted_position == Position.HOLD),
+                # When a signal to buy is generated, or when holding, returns are same as daily returns
+                returns,
+                0,  # Default
+            ),
+        ),
+    )
+
+
+def simulate_signal_matrix(
+    buy_signals: np.ndarray,
+    sell_signals: np.ndarray,
+    returns: np.ndarray,
+    open_returns: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run steps 2-8 of `Backtester.backtest_strategy_perf` column-wise.
+
+    `returns` and `open_returns` are either one price series shared by every
+    signal column or an array of the same shape as the signals (one column per
+    ticker). Returns the adjusted positions and adjusted returns.
+    """
+    hold = compute_hold_signal(buy_signals, sell_signals)
+    valid_sell, valid_hold = compute_valid_sell_hold(buy_signals, sell_signals, hold)
+    position = compute_position(buy_signals, sell_signals, hold, valid_sell, valid_hold)
+    adjusted_position = _shift_rows(position, 0)
+    adjusted_returns = compute_adjusted_returns(adjusted_position, returns, open_returns)
+    return adjusted_position, adjusted_returns
+
+
+class Backtester:
+    def __init__(
+        self,
+        data: Union[Dict[str, Any], pd.DataFrame],
+        signals: Optional[Union[SignalModel, SignalArrayModel]] = None,
+        position_engine: Literal["vectorized", "loop"] = BACKTEST_POSITION_ENGINE,
+        work_dir: str = WORK_DIR,
+        risk_free_rate: float = 0.02,
+    ):
+        if position_engine not in ("vectorized", "loop"):
+            raise ValueError(
+                f"Unsupported position engine: {position_engine}. Use 'vectorized' or 'loop'."
+            )
+        # A DataFrame is used as is (no copy) and annotated in place; the
+        # `Date` index from `read_price_csv` becomes a column for positional rows
+        if isinstance(data, pd.DataFrame):
+            if isinstance(data.index, pd.DatetimeIndex):
+                data = data.reset_index()
+            self.data = data
+        else:
+            self.data = pd.DataFrame.from_dict(data)
+        self.signals = signals
+        self.position_engine = position_engine
+        self.risk_free_rate = risk_free_rate
+        # Results, metrics and state files are written here
+        self.work_dir = work_dir
+        self.results = None
+        self.state: Optional[BacktestState] = None
+
+    def _compute_valid_sell_hold_loop(self) -> None:
+        # Legacy row-by-row state machine, kept to diff against the vectorized engine
         self.data["ValidSell"] = False
         self.data["ValidHold"] = False
         buy_occurred = False
@@ -152,99 +521,484 @@ class Backtester:
             if self.data.loc[i, "HoldSignal"] == Position.HOLD and buy_occurred:
                 self.data.loc[i, "ValidHold"] = True  # Valid hold
 
-        # Step 4: Calculate Position
-        self.data["Position"] = np.where(
-            (self.data["HoldSignal"] == Position.HOLD) & (self.data["ValidHold"] == True),
-            Position.HOLD,
-            np.where(
-                self.data["BuySignal"] == 1,
-                Position.BUY,
-                np.where(
-                    (self.data["SellSignal"] == 1) & (self.data["ValidSell"] == True),
-                    Position.SELL,
-                    Position.NO_HOLD,
-                ),
-            ),
+    def _compute_valid_sell_hold_vectorized(self) -> None:
+        valid_sell, valid_hold = compute_valid_sell_hold(
+            self.data["BuySignal"].to_numpy(),
+            self.data["SellSignal"].to_numpy(),
+            self.data["HoldSignal"].to_numpy(),
         )
+        self.data["ValidSell"] = valid_sell
+        self.data["ValidHold"] = valid_hold
 
+    def _compute_price_returns(self) -> None:
         # Step 5: Calculate raw returns based on adjusted close prices
         self.data["Returns"] = self.data["Adj Close"].ffill().pct_change().fillna(0)
 
-        # Step 6: Shift positions for returns calculation
-        # Investment stock for current date is determined by previous date's position
-        self.data["Adjusted Position"] = self.data["Position"].shift(1).fillna(0)
-
         # Step 7: Shift close prices for returns calculation
         self.data["Close(PrevDay)"] = self.data["Close"].shift(1)
 
         # fix: ("unsupported operand type(s) for /: 'float' and 'str'",)
-        self.data["Open"] = pd.to_numeric(self.data["Open"], errors='coerce')
-        self.data["Close(PrevDay)"] = pd.to_numeric(self.data["Close(PrevDay)"], errors='coerce')
+        # Only untyped input needs this; `read_price_csv` already yields floats
+        for column in ("Open", "Close(PrevDay)"):
+            if not pd.api.types.is_numeric_dtype(self.data[column]):
+                self.data[column] = pd.to_numeric(self.data[column], errors="coerce")
 
-        # Step 8: Calculate adjusted returns
-        self.data["Adjusted Returns"] = np.where(
-            self.data["Adjusted Position"] == Position.NO_HOLD,
-            0,
-            np.where(
-                self.data["Adjusted Position"] == Position.SELL,
-                # When a signal to sell is generated, sell at the open price
-                # Therefore, returns are calculated as (Open / Close(PrevDay)) - 1
-                (self.data["Open"] / self.data["Close(PrevDay)"] - 1).fillna(0),
-                np.where(
-                    (self.data["Adjusted Position"] == Position.BUY)
-                    | (self.data["Adjusted Position"] == Position.HOLD),
-                    # When a signal to buy is generated, or when holding, returns are same as daily returns
-                    self.data["Returns"],
-                    0,  # Default
-                ),
-            ),
-        )
+    def _open_returns(self) -> np.ndarray:
+        return (self.data["Open"] / self.data["Close(PrevDay)"] - 1).fillna(0).to_numpy()
 
-        cumulative_returns = (1 + self.data["Adjusted Returns"]).cumprod().fillna(1)
-        self.data["Cumulative Returns"] = cumulative_returns
+    def backtest_signal_matrix(
+        self,
+        buy_signals: np.ndarray,
+        sell_signals: np.ndarray,
+        strategy_names: Optional[List[str]] = None,
+        risk_free_rate: float = 0.02,
+        chunk_size: int = 512,
+    ) -> pd.DataFrame:
+        """
+        Backtest many signal sets against the price data in one vectorized pass.
 
-        cumulative_max = cumulative_returns.cummax()
-        drawdown = (cumulative_max - cumulative_returns) / cumulative_max
-        mdd_series = drawdown.cummax()
-        self.data["MDD"] = mdd_series
-        mdd = drawdown.max()
+        `buy_signals` and `sell_signals` are (n_bars x n_strategies) arrays aligned
+        with the price rows. Positions, adjusted returns and cumulative returns are
+        computed column-wise with the same rules as `backtest_strategy_perf`, and a
+        metrics table with one row per strategy is returned. Strategies are
+        processed in blocks of `chunk_size` columns to bound peak memory.
+        """
+        buy_signals = np.asarray(buy_signals).astype(int)
+        sell_signals = np.asarray(sell_signals).astype(int)
+        if buy_signals.ndim == 1:
+            buy_signals = buy_signals.reshape(-1, 1)
+            sell_signals = sell_signals.reshape(-1, 1)
+        if buy_signals.shape != sell_signals.shape:
+            raise ValueError(
+                f"Signal shapes differ: {buy_signals.shape} and {sell_signals.shape}."
+            )
+        if buy_signals.shape[0] != len(self.data):
+            raise ValueError(
+                f"Signals have {buy_signals.shape[0]} bars, price data has {len(self.data)}."
+            )
+
+        n_strategies = buy_signals.shape[1]
+        if strategy_names is None:
+            strategy_names = [f"strategy_{i}" for i in range(n_strategies)]
+        elif len(strategy_names) != n_strategies:
+            raise ValueError(
+                f"Got {len(strategy_names)} strategy names for {n_strategies} strategies."
+            )
+
+        # Price returns are shared by every strategy, so compute them once
+        self._compute_price_returns()
+        returns = self.data["Returns"].to_numpy()
+        open_returns = self._open_returns()
+
+        metrics: Dict[str, np.ndarray] = {}
+        for start in range(0, n_strategies, chunk_size):
+            block = slice(start, start + chunk_size)
+            adjusted_position, adjusted_returns = simulate_signal_matrix(
+                buy_signals[:, block], sell_signals[:, block], returns, open_returns
+            )
+            block_metrics = PerformanceMetricsCalculator.calculate_risk_statistics(
+                adjusted_returns, adjusted_position, risk_free_rate=risk_free_rate
+            )
+            for name, values in block_metrics.items():
+                metrics.setdefault(name, np.empty(n_strategies))[block] = values
 
-        start_value = cumulative_returns.iloc[0]
-        end_value = cumulative_returns.iloc[-1]
-        periods = len(cumulative_returns) / 252
+        return pd.DataFrame(metrics, index=pd.Index(strategy_names, name="strategy"))
+
+    def backtest_walk_forward(
+        self,
+        train_bars: int = 756,
+        test_bars: int = 252,
+        step_bars: Optional[int] = None,
+        risk_free_rate: float = 0.02,
+    ) -> pd.DataFrame:
+        """
+        Evaluate the strategy over rolling train/test windows.
+
+        Positions, adjusted returns and cumulative returns are computed once over
+        the whole history. Every window is then a slice of those arrays: all
+        windows of a segment are gathered into one (window_bars x n_windows)
+        matrix and scored with a single column-wise metrics call.
+        """
+        step_bars = step_bars or test_bars
+        n_bars = len(self.data)
+        window_starts = np.arange(0, n_bars - (train_bars + test_bars) + 1, step_bars)
+        if len(window_starts) == 0:
+            raise ValueError(
+                f"Not enough data for walk-forward windows: {n_bars} bars, "
+                f"{train_bars + test_bars} required."
+            )
+
+        self._compute_price_returns()
+        adjusted_position, adjusted_returns = simulate_signal_matrix(
+            np.asarray(self.signals.BuySignal).astype(int),
+            np.asarray(self.signals.SellSignal).astype(int),
+            self.data["Returns"].to_numpy(),
+            self._open_returns(),
+        )
+        cumulative_returns = PerformanceMetricsCalculator.calculate_cumulative_returns(
+            adjusted_returns
+        )
 
+        dates = self.data["Date"] if "Date" in self.data else self.data.index
+        results = {"window": np.arange(len(window_starts))}
+        for segment, offset, length in (
+            ("train", 0, train_bars),
+            ("test", train_bars, test_bars),
+        ):
+            rows = window_starts + offset + np.arange(length).reshape(-1, 1)
+            results[f"{segment}_start"] = dates.to_numpy()[rows[0]]
+            results[f"{segment}_end"] = dates.to_numpy()[rows[-1]]
+            metrics = PerformanceMetricsCalculator.calculate_risk_statistics(
+                adjusted_returns[rows],
+                adjusted_position[rows],
+                cumulative_returns=cumulative_returns[rows],
+                risk_free_rate=risk_free_rate,
+            )
+            for name, values in metrics.items():
+                results[f"{segment}_{name}"] = values
+
+        return pd.DataFrame(results)
+
+    def _save_performance_metrics(
+        self, start_value: float, end_value: float, statistics: Dict[str, float]
+    ) -> BacktestPerformanceMetrics:
         # calculate cumulative return by start and end value
         perf_cumulative_returns = (end_value / start_value) - 1
-        positions = pd.Series(self.data["Adjusted Position"])
-        returns = pd.Series(self.data["Adjusted Returns"])
 
-        cagr = PerformanceMetricsCalculator.calculate_cagr(
-            start_value, end_value, periods
-        )
-        mdd = PerformanceMetricsCalculator.calculate_mdd(cumulative_returns, positions)
-        sharpe = PerformanceMetricsCalculator.calculate_sharpe_ratio(
-            returns, positions, risk_free_rate=0.02, period="daily"
+        metrics = BacktestPerformanceMetrics(
+            cumulative_return=f"Cumulative Return: {perf_cumulative_returns:.2%}",
+            cagr=f"CAGR: {statistics['cagr']:.2%}",
+            mdd=f"MDD: {statistics['mdd']:.2%}",
+            sharpe_ratio=f"Sharpe Ratio: {statistics['sharpe_ratio']:.2f}",
+            sortino_ratio=f"Sortino Ratio: {statistics['sortino_ratio']:.2f}",
+            calmar_ratio=f"Calmar Ratio: {statistics['calmar_ratio']:.2f}",
+            max_drawdown_duration=(
+                f"Max Drawdown Duration: {statistics['max_drawdown_duration']:.0f} bars"
+            ),
+            exposure=f"Exposure: {statistics['exposure']:.2%}",
+            turnover=f"Turnover: {statistics['turnover']:.2f} trades/year",
+            win_rate=f"Win Rate: {statistics['win_rate']:.2%}",
+            profit_factor=f"Profit Factor: {statistics['profit_factor']:.2f}",
         )
 
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backtest_results_file_path = os.path.join(WORK_DIR, BACKTEST_RESULTS_FILE)
-        self.data.to_excel(backtest_results_file_path, index=False)
-
-        backtest_metrics_file_path = os.path.join(WORK_DIR, BACKTEST_METRICS_FILE)
+        backtest_metrics_file_path = os.path.join(self.work_dir, BACKTEST_METRICS_FILE)
         with open(backtest_metrics_file_path, "w") as f:
             f.write(f"Backtest Results {timestamp_str}\n")
             f.write(f"Start Value: {start_value:.2f}\n")
             f.write(f"End Value: {end_value:.2f}\n")
-            f.write(f"Cumulative Return: {perf_cumulative_returns:.2%}\n")
-            f.write(f"CAGR: {cagr:.2%}\n")
-            f.write(f"MDD: {mdd:.2%}\n")
-            f.write(f"Sharpe Ratio: {sharpe:.2f}\n")
+            for metric in metrics.model_dump().values():
+                f.write(f"{metric}\n")
 
-        self.results = BacktestPerformanceMetrics(
-            cumulative_return=f"Cumulative Return: {perf_cumulative_returns:.2%}",
-            cagr=f"CAGR: {cagr:.2%}",
-            mdd=f"MDD: {mdd:.2%}",
-            sharpe_ratio=f"Sharpe Ratio: {sharpe:.2f}",
+        return metrics
+
+    def _build_state(self, statistics: Dict[str, float]) -> BacktestState:
+        # Summarise a full run into the running state used by `update`
+        buy = self.data["BuySignal"].to_numpy()
+        sell = self.data["SellSignal"].to_numpy()
+        events = np.flatnonzero((buy == 1) | (sell == 1))
+        cumulative_returns = self.data["Cumulative Returns"].to_numpy()
+        positions = self.data["Adjusted Position"].to_numpy()
+        returns = self.data["Adjusted Returns"].to_numpy()
+
+        active = positions != 0
+        mdd_active = np.concatenate(([True], active[:-1]))
+        invested = np.isin(positions, [Position.BUY, Position.HOLD, Position.SELL])
+        active_returns = returns[active]
+        active_mean = active_returns.mean() if len(active_returns) else 0.0
+        invested_returns = returns * invested
+        peaks = np.flatnonzero(cumulative_returns >= np.maximum.accumulate(cumulative_returns))
+        last_adj_close = self.data["Adj Close"].ffill().iloc[-1]
+        prev_close = pd.to_numeric(self.data["Close"], errors="coerce").iloc[-1]
+
+        return BacktestState(
+            n_bars=len(self.data),
+            prev_buy_signal=int(buy[-1]),
+            prev_sell_signal=int(sell[-1]),
+            buy_occurred=bool(len(events) and buy[events[-1]] == 1),
+            prev_position=int(self.data["Position"].iloc[-1]),
+            prev_adjusted_position=float(positions[-1]),
+            prev_close=None if pd.isna(prev_close) else float(prev_close),
+            last_adj_close=None if pd.isna(last_adj_close) else float(last_adj_close),
+            start_value=float(cumulative_returns[0]),
+            cumulative_return=float(cumulative_returns[-1]),
+            running_max=float(cumulative_returns.max()),
+            max_drawdown=float(self.data["MDD"].iloc[-1]),
+            active_running_max=float(cumulative_returns[mdd_active].max()),
+            active_min_drawdown=statistics["mdd"],
+            bars_since_peak=len(self.data) - 1 - int(peaks[-1]),
+            max_drawdown_duration=int(statistics["max_drawdown_duration"]),
+            risk_free_rate=self.risk_free_rate,
+            active_count=len(active_returns),
+            active_mean=float(active_mean),
+            active_m2=float(((active_returns - active_mean) ** 2).sum()),
+            active_downside_sum_squares=float(
+                (np.minimum(active_returns - self.risk_free_rate / 252, 0) ** 2).sum()
+            ),
+            prev_invested=bool(invested[-1]),
+            invested_count=int(invested.sum()),
+            invested_changes=int((invested[1:] != invested[:-1]).sum()),
+            win_count=int((invested_returns > 0).sum()),
+            gross_profit=float(np.maximum(invested_returns, 0).sum()),
+            gross_loss=float(-np.minimum(invested_returns, 0).sum()),
+        )
+
+    def save_state(self, state_file_path: Optional[str] = None) -> str:
+        state_file_path = state_file_path or os.path.join(self.work_dir, BACKTEST_STATE_FILE)
+        tmp_file_path = f"{state_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file_path, "w") as f:
+            f.write(self.state.model_dump_json(indent=4))
+        os.replace(tmp_file_path, state_file_path)
+        return f'Backtest state saved to "{state_file_path}"'
+
+    @classmethod
+    def from_state(
+        cls, state_file_path: Optional[str] = None, work_dir: str = WORK_DIR
+    ) -> "Backtester":
+        state_file_path = state_file_path or os.path.join(work_dir, BACKTEST_STATE_FILE)
+        with open(state_file_path, "r") as f:
+            state = BacktestState.model_validate_json(f.read())
+        backtester = cls({}, work_dir=work_dir, risk_free_rate=state.risk_free_rate)
+        backtester.state = state
+        return backtester
+
+    def _state_statistics(self) -> Dict[str, float]:
+        # Same definitions as `PerformanceMetricsCalculator.calculate_risk_statistics`
+        state = self.state
+        daily_risk_free_rate = state.risk_free_rate / 252
+        periods = state.n_bars / 252
+        cagr = PerformanceMetricsCalculator.calculate_cagr(
+            state.start_value, state.cumulative_return, periods
+        )
+        mdd = state.active_min_drawdown
+
+        sharpe = sortino = 0
+        if state.active_count == 1:
+            # The sample standard deviation of one return is undefined
+            sharpe = np.nan
+        elif state.active_count > 1:
+            std_dev = (state.active_m2 / (state.active_count - 1)) ** 0.5
+            if std_dev != 0:
+                sharpe = (state.active_mean - daily_risk_free_rate) / std_dev
+        if state.active_count > 0:
+            downside_dev = (state.active_downside_sum_squares / state.active_count) ** 0.5
+            if downside_dev != 0:
+                sortino = (state.active_mean - daily_risk_free_rate) / downside_dev
+
+        if state.gross_loss > 0:
+            profit_factor = state.gross_profit / state.gross_loss
+        else:
+            profit_factor = np.inf if state.gross_profit > 0 else 0
+
+        return {
+            "cagr": cagr,
+            "mdd": mdd,
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "calmar_ratio": cagr / abs(mdd) if mdd < 0 else 0,
+            "max_drawdown_duration": state.max_drawdown_duration,
+            "exposure": state.invested_count / state.n_bars,
+            "turnover": state.invested_changes / periods,
+            "win_rate": (
+                state.win_count / state.invested_count if state.invested_count else 0
+            ),
+            "profit_factor": profit_factor,
+        }
+
+    def update(
+        self,
+        new_data: Union[Dict[str, Any], pd.DataFrame],
+        new_signals: Union[SignalModel, SignalArrayModel],
+    ) -> BacktestPerformanceMetrics:
+        """
+        Append new bars to a finished backtest in O(new bars).
+
+        Runs the same state machine and return rules as `backtest_strategy_perf`
+        one bar at a time from `self.state`, so the metrics match a full
+        recompute over the extended history without touching the old bars.
+        """
+        if self.state is None:
+            raise ValueError("No backtest state. Run backtest_strategy_perf or load a state first.")
+
+        if not isinstance(new_data, pd.DataFrame):
+            new_data = pd.DataFrame.from_dict(new_data)
+        open_prices = pd.to_numeric(new_data["Open"], errors="coerce").to_numpy()
+        close_prices = pd.to_numeric(new_data["Close"], errors="coerce").to_numpy()
+        adj_close_prices = pd.to_numeric(new_data["Adj Close"], errors="coerce").to_numpy()
+        buy_signals = np.asarray(new_signals.BuySignal).astype(int)
+        sell_signals = np.asarray(new_signals.SellSignal).astype(int)
+        if not len(buy_signals) == len(sell_signals) == len(new_data):
+            raise ValueError("New signals and new price data must have the same length.")
+
+        state = self.state.model_copy()
+        for i in range(len(new_data)):
+            buy, sell = int(buy_signals[i]), int(sell_signals[i])
+
+            # Steps 2-4: hold signal, valid sell/hold and position
+            hold = compute_hold_signal(
+                np.array([state.prev_buy_signal, buy]),
+                np.array([state.prev_sell_signal, sell]),
+            )[-1]
+            valid_sell = valid_hold = False
+            if buy == 1:
+                state.buy_occurred = True
+            else:
+                if sell == 1 and state.buy_occurred:
+                    valid_sell = True
+                    state.buy_occurred = False
+                if hold == Position.HOLD and state.buy_occurred:
+                    valid_hold = True
+            position = int(compute_position(buy, sell, hold, valid_sell, valid_hold))
+
+            # Steps 5-8: returns of the bar under the previous bar's position
+            adj_close = adj_close_prices[i]
+            if np.isnan(adj_close) and state.last_adj_close is not None:
+                adj_close = state.last_adj_close
+            returns = (
+                adj_close / state.last_adj_close - 1
+                if state.last_adj_close is not None
+                else np.nan
+            )
+            open_returns = (
+                open_prices[i] / state.prev_close - 1
+                if state.prev_close is not None
+                else np.nan
+            )
+            adjusted_position = state.prev_position
+            adjusted_returns = float(
+                compute_adjusted_returns(
+                    np.array([adjusted_position]),
+                    np.array([0.0 if np.isnan(returns) else returns]),
+                    np.array([0.0 if np.isnan(open_returns) else open_returns]),
+                )[0]
+            )
+
+            # Cumulative returns and drawdowns
+            state.cumulative_return *= 1 + adjusted_returns
+            state.running_max = max(state.running_max, state.cumulative_return)
+            state.max_drawdown = max(
+                state.max_drawdown,
+                (state.running_max - state.cumulative_return) / state.running_max,
+            )
+            if state.cumulative_return >= state.running_max:
+                state.bars_since_peak = 0
+            else:
+                state.bars_since_peak += 1
+            state.max_drawdown_duration = max(
+                state.max_drawdown_duration, state.bars_since_peak
+            )
+            if state.prev_adjusted_position != 0:
+                state.active_running_max = max(
+                    state.active_running_max, state.cumulative_return
+                )
+                state.active_min_drawdown = min(
+                    state.active_min_drawdown,
+                    state.cumulative_return / state.active_running_max - 1,
+                )
+
+            # Sharpe (Welford) and Sortino accumulators
+            if adjusted_position != 0:
+                state.active_count += 1
+                delta = adjusted_returns - state.active_mean
+                state.active_mean += delta / state.active_count
+                state.active_m2 += delta * (adjusted_returns - state.active_mean)
+                state.active_downside_sum_squares += (
+                    min(adjusted_returns - state.risk_free_rate / 252, 0) ** 2
+                )
+
+            # Trading statistics
+            invested = adjusted_position in (Position.BUY, Position.HOLD, Position.SELL)
+            state.invested_changes += int(invested != state.prev_invested)
+            state.prev_invested = invested
+            if invested:
+                state.invested_count += 1
+                state.win_count += int(adjusted_returns > 0)
+                state.gross_profit += max(adjusted_returns, 0)
+                state.gross_loss += -min(adjusted_returns, 0)
+
+            state.n_bars += 1
+            state.prev_buy_signal, state.prev_sell_signal = buy, sell
+            state.prev_position = position
+            state.prev_adjusted_position = float(adjusted_position)
+            state.prev_close = (
+                None if np.isnan(close_prices[i]) else float(close_prices[i])
+            )
+            if not np.isnan(adj_close):
+                state.last_adj_close = float(adj_close)
+
+        self.state = state
+        self.results = self._save_performance_metrics(
+            state.start_value, state.cumulative_return, self._state_statistics()
+        )
+        return self.results
+
+    def backtest_strategy_perf(self) -> BacktestPerformanceMetrics:
+        # Step 1: Initialize Buy and Sell Signals
+        self.data["BuySignal"] = np.asarray(self.signals.BuySignal).astype(int)
+        self.data["SellSignal"] = np.asarray(self.signals.SellSignal).astype(int)
+
+        # Step 2: Define HoldSignal
+        self.data["HoldSignal"] = compute_hold_signal(
+            self.data["BuySignal"].to_numpy(), self.data["SellSignal"].to_numpy()
+        )
+
+        # Step 3: Determine valid sells and holds
+        # A sell or hold is only valid when a buy signal occurred before it
+        if self.position_engine == "loop":
+            self._compute_valid_sell_hold_loop()
+        else:
+            self._compute_valid_sell_hold_vectorized()
+
+        # Step 4: Calculate Position
+        self.data["Position"] = compute_position(
+            self.data["BuySignal"].to_numpy(),
+            self.data["SellSignal"].to_numpy(),
+            self.data["HoldSignal"].to_numpy(),
+            self.data["ValidSell"].to_numpy(),
+            self.data["ValidHold"].to_numpy(),
+        )
+
+        # Step 5 and 7: Calculate raw returns and previous day close prices
+        self._compute_price_returns()
+
+        # Step 6: Shift positions for returns calculation
+        # Investment stock for current date is determined by previous date's position
+        self.data["Adjusted Position"] = self.data["Position"].shift(1).fillna(0)
+
+        # Step 8: Calculate adjusted returns
+        self.data["Adjusted Returns"] = compute_adjusted_returns(
+            self.data["Adjusted Position"].to_numpy(),
+            self.data["Returns"].to_numpy(),
+            self._open_returns(),
+        )
+
+        cumulative_returns = (1 + self.data["Adjusted Returns"]).cumprod().fillna(1)
+        self.data["Cumulative Returns"] = cumulative_returns
+
+        cumulative_max = cumulative_returns.cummax()
+        drawdown = (cumulative_max - cumulative_returns) / cumulative_max
+        mdd_series = drawdown.cummax()
+        self.data["MDD"] = mdd_series
+
+        # Step 9: Calculate every performance statistic in one fused kernel,
+        # reusing the cumulative returns and running maximum computed above
+        statistics = PerformanceMetricsCalculator.calculate_risk_statistics(
+            self.data["Adjusted Returns"].to_numpy(),
+            self.data["Adjusted Position"].to_numpy(),
+            cumulative_returns=cumulative_returns.to_numpy(),
+            cumulative_max=cumulative_max.to_numpy(),
+            risk_free_rate=self.risk_free_rate,
+        )
+
+        backtest_results_file_path = os.path.join(self.work_dir, BACKTEST_RESULTS_FILE)
+        save_backtest_results(self.data, backtest_results_file_path)
+
+        # Saved next to the results, so `update_backtest_stock_strategy` can
+        # append the next bars without a full recompute
+        self.state = self._build_state(statistics)
+        self.save_state()
+        self.results = self._save_performance_metrics(
+            cumulative_returns.iloc[0], cumulative_returns.iloc[-1], statistics
         )
         return self.results
 
@@ -258,41 +1012,116 @@ def fetch_stock_data(
     data_file_path: Annotated[str, "File path to store/load data"] = DATASET_STOCK,
 ) -> str:
     handler = StockDataHandler(ticker, start_date, end_date, data_file_path)
-    data = handler.get_data()
-    return f"Stock data loaded from {data_file_path} with {len(data['Close'])} records."
+    data = handler.get_frame()
+    return f"Stock data loaded from {data_file_path} with {len(data)} records."
 
 
 def fetch_stock_signals(file_path: str) -> SignalModel:
-    handler = StockDataHandler("", "", "", file_path)
-    data = handler.load_data_from_csv()
-    generator = SignalGenerator(data)
-    return generator.generate_signals_model()
+    signals = read_signals(file_path)
+    return SignalModel(
+        BuySignal=signals.BuySignal.tolist(),
+        SellSignal=signals.SellSignal.tolist(),
+        Description=signals.Description,
+    )
 
 
 def backtest_stock_strategy(
     stock_price_file_path: Annotated[str, "a file path of Stock price data"],
     stock_signals_file_path: Annotated[str, "a file path of Stock signal data"],
+    work_dir: Annotated[str, "a directory for the backtest results"] = WORK_DIR,
 ) -> BacktestPerformanceMetrics:
     try:
         price_handler = StockDataHandler("", "", "", stock_price_file_path)
-        price_dict = price_handler.load_data_from_csv()
+        price_data = price_handler.load_prices_from_csv()
     except Exception as e:
         return f"Error loading stock price data: {e}"
 
     try:
-        signals_handler = StockDataHandler("", "", "", stock_signals_file_path)
-        signals_dict = signals_handler.load_data_from_csv()
+        signals = read_signals(stock_signals_file_path)
     except Exception as e:
         return f"Error loading stock signals data: {e}"
 
     try:
-        generator = SignalGenerator(signals_dict)
-        signals = generator.generate_signals_model()
+        backtester = Backtester(price_data, signals, work_dir=work_dir)
+        return backtester.backtest_strategy_perf()
     except Exception as e:
-        return f"Error generating signals: {e}"
+        return f"Error during backtesting: {e}"
+
+
+def backtest_stock_strategies(
+    stock_price_file_path: Annotated[str, "a file path of Stock price data"],
+    stock_signals_file_paths: Annotated[
+        Dict[str, str], "Strategy names mapped to their Stock signal data file paths"
+    ],
+) -> pd.DataFrame:
+    # Load the price data once and score every signal file in one batch
+    price_handler = StockDataHandler("", "", "", stock_price_file_path)
+    price_data = price_handler.load_prices_from_csv()
+
+    buy_signals, sell_signals = [], []
+    for stock_signals_file_path in stock_signals_file_paths.values():
+        signals = read_signals(stock_signals_file_path)
+        buy_signals.append(signals.BuySignal)
+        sell_signals.append(signals.SellSignal)
 
+    backtester = Backtester(price_data)
+    return backtester.backtest_signal_matrix(
+        np.column_stack(buy_signals),
+        np.column_stack(sell_signals),
+        strategy_names=list(stock_signals_file_paths.keys()),
+    )
+
+
+def walk_forward_backtest(
+    stock_price_file_path: Annotated[str, "a file path of Stock price data"],
+    stock_signals_file_path: Annotated[str, "a file path of Stock signal data"],
+    train_bars: Annotated[int, "Number of trading days in each train window"] = 756,
+    test_bars: Annotated[int, "Number of trading days in each test window"] = 252,
+    step_bars: Annotated[
+        Optional[int], "Trading days between window starts, defaults to test_bars"
+    ] = None,
+) -> pd.DataFrame:
     try:
-        backtester = Backtester(price_dict, signals)
-        return backtester.backtest_strategy_perf()
+        price_handler = StockDataHandler("", "", "", stock_price_file_path)
+        price_data = price_handler.load_prices_from_csv()
     except Exception as e:
-        return f"Error during backtesting: {e}"
+        return f"Error loading stock price data: {e}"
+
+    try:
+        signals = read_signals(stock_signals_file_path)
+    except Exception as e:
+        return f"Error loading stock signals data: {e}"
+
+    try:
+        backtester = Backtester(price_data, signals)
+        return backtester.backtest_walk_forward(train_bars, test_bars, step_bars)
+    except Exception as e:
+        return f"Error during walk-forward backtesting: {e}"
+
+
+def update_backtest_stock_strategy(
+    new_stock_price_file_path: Annotated[str, "a file path of new Stock price rows"],
+    new_stock_signals_file_path: Annotated[str, "a file path of new Stock signal rows"],
+    state_file_path: Annotated[
+        Optional[str], "a file path of the saved backtest state"
+    ] = None,
+    work_dir: Annotated[str, "a directory for the backtest results and state"] = WORK_DIR,
+) -> BacktestPerformanceMetrics:
+    try:
+        backtester = Backtester.from_state(state_file_path, work_dir=work_dir)
+    except Exception as e:
+        return f"Error loading backtest state: {e}"
+
+    try:
+        price_handler = StockDataHandler("", "", "", new_stock_price_file_path)
+        price_data = price_handler.load_prices_from_csv()
+        signals = read_signals(new_stock_signals_file_path)
+    except Exception as e:
+        return f"Error loading new stock data: {e}"
+
+    try:
+        results = backtester.update(price_data, signals)
+        backtester.save_state(state_file_path)
+        return results
+    except Exception as e:
+        return f"Error during incremental backtesting: {e}"
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+import ta
+from .const import INDICATOR_CACHE_DIR, INDICATOR_CACHE_MAX_MB
+
+
+def series_fingerprint(series: pd.Series) -> str:
+    # Values only: the same prices re-read from disk hash the same
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Cache of indicator series keyed by (input data fingerprint, indicator,
+    parameters). Entries are kept in a small in-memory LRU and as single-column
+    Parquet files on disk; the least recently used files are evicted once the
+    directory grows beyond `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = INDICATOR_CACHE_DIR,
+        max_bytes: int = INDICATOR_CACHE_MAX_MB * 1024 * 1024,
+        max_memory_entries: int = 256,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, pd.Series]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(
+        self, func: Callable, output: Optional[str], kwargs: Dict[str, Any]
+    ) -> str:
+        params = {}
+        for name, value in sorted(kwargs.items()):
+            if isinstance(value, pd.Series):
+                params[name] = {"series": series_fingerprint(value)}
+            else:
+                params[name] = value
+        key = {
+            "indicator": f"{func.__module__}.{func.__qualname__}",
+            "output": output,
+            "params": params,
+            "ta": getattr(ta, "__version__", None),
+        }
+        return hashlib.sha1(
+            json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def _remember(self, key: str, values: pd.Series) -> None:
+        self._memory[key] = values
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".parquet"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        # Oldest mtime first; hits touch their file, so this is least recently used
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def get_or_compute(
+        self, func: Callable, output: Optional[str] = None, **kwargs: Any
+    ) -> pd.Series:
+        index = next(
+            (v.index for v in kwargs.values() if isinstance(v, pd.Series)), None
+        )
+        key = self._key(func, output, kwargs)
+
+        with self._lock:
+            values = self._memory.get(key)
+            if values is not None:
+                self._memory.move_to_end(key)
+        path = self._path(key)
+        if values is None and os.path.exists(path):
+            try:
+                values = pd.read_parquet(path).iloc[:, 0]
+                os.utime(path)
+            except (OSError, ValueError):
+                values = None
+
+        if values is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            result = func(**kwargs)
+            if output is not None:
+                # Class-based indicators, e.g. ta.trend.MACD(...).macd_diff()
+                result = getattr(result, output)()
+            values = result.reset_index(drop=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            values.to_frame(name=values.name or "value").to_parquet(
+                f"{path}.{os.getpid()}.tmp", index=False
+            )
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+            self._evict()
+
+        with self._lock:
+            self._remember(key, values)
+        result = values.copy()
+        if index is not None and len(index) == len(result):
+            result.index = index
+        return result
+
+
+_default_cache: Optional[IndicatorCache] = None
+
+
+def cached_indicator(
+    func: Callable, output: Optional[str] = None, **kwargs: Any
+) -> pd.Series:
+    """
+    Drop-in cached call of a `ta` indicator, for use in generated signal code:
+
+        from utils.indicator_cache import cached_indicator
+        df["MA10"] = cached_indicator(ta.trend.sma_indicator, close=df["Adj Close"], window=10)
+        df["MACD"] = cached_indicator(ta.trend.MACD, output="macd_diff", close=df["Adj Close"])
+
+    Pass every input as a keyword argument so it is part of the cache key.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache.get_or_compute(func, output, **kwargs)
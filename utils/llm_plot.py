@@ -1,16 +1,17 @@
 import seaborn as sns
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import random
 from utils.const import WORK_DIR, BACKTEST_RESULTS_FILE, PLOT_FILE_NAME
+from utils.functions import load_backtest_results
 
 
-def plot_backtest_results():
+def plot_backtest_results(work_dir: str = WORK_DIR):
     """
-    Plot backtest results from an Excel file and save the plot as a PNG file.
+    Plot backtest results from the results file in `work_dir` and save the plot as a PNG file.
     """
-    abs_path = os.path.abspath(WORK_DIR)
+    abs_path = os.path.abspath(work_dir)
     file_path = os.path.join(abs_path, BACKTEST_RESULTS_FILE)
 
     if not os.path.exists(file_path):
@@ -19,7 +20,7 @@ def plot_backtest_results():
     plot_output_path = os.path.join(abs_path, PLOT_FILE_NAME)
 
     # Load the data
-    df = pd.read_excel(file_path)
+    df = load_backtest_results(file_path)
 
     # Convert date column to datetime if necessary
     df["Date"] = pd.to_datetime(df["Date"])
@@ -35,8 +36,10 @@ def plot_backtest_results():
     colors = ["red", "orange"]
     mdd_color = random.choice(colors)
 
-    # Create subplots
-    fig, axs = plt.subplots(2, 1, figsize=(10, 8))
+    # Create subplots on a standalone Figure rather than pyplot's global
+    # current figure, so strategies plotting in parallel threads stay apart
+    fig = Figure(figsize=(10, 8))
+    axs = fig.subplots(2, 1)
 
     # Plot Cumulative Returns
     axs[0].plot(
@@ -56,8 +59,7 @@ def plot_backtest_results():
     axs[1].legend()
 
     # Save the plot
-    plt.tight_layout()
-    plt.savefig(plot_output_path)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(plot_output_path)
 
 
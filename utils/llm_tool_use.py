@@ -1,18 +1,49 @@
+import asyncio
+import functools
 import json
 import os
-from utils.const import WORK_DIR, DATASET_STOCK, STRATEGY_IDEAS
-from utils.functions import fetch_stock_data, backtest_stock_strategy
+from utils.const import WORK_DIR, STRATEGY_IDEAS
+from utils.functions import (
+    backtest_stock_strategy,
+    walk_forward_backtest,
+)
+from utils.bulk_download import fetch_stock_universe
+from utils.workspace import link_stock_data
 from utils.web_search import WebSearch
 from datetime import datetime
-from typing import Annotated, Dict
+from typing import Annotated, Callable, Dict
 from autogen import ConversableAgent
 from utils.const import AgentName
 from utils.datamodels import BacktestPerformanceMetrics
 from utils.llm_plot import plot_backtest_results
 
 
+def to_thread_tool(func: Callable) -> Callable:
+    """
+    Async wrapper of a blocking tool for async chats: autogen runs sync tools
+    on the event loop, which would stall every other chat in the meantime.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def _identity(func: Callable) -> Callable:
+    return func
+
+
 class ToolRegistry:
-    def __init__(self, agent_registry: Dict[AgentName, ConversableAgent]):
+    def __init__(
+        self,
+        agent_registry: Dict[AgentName, ConversableAgent],
+        work_dir: str = WORK_DIR,
+        async_tools: bool = False,
+    ):
+        self._work_dir = work_dir
+        self._tool = to_thread_tool if async_tools else _identity
         self._user_proxy = agent_registry.get(AgentName.USER_PROXY)
         self._stock_analysis_agent = agent_registry.get(AgentName.STOCK_ANALYSIS_AGENT)
         self._custom_signal_analysis_agent = agent_registry.get(
@@ -21,16 +52,23 @@ class ToolRegistry:
         self._strategy_idea_agent = agent_registry.get(AgentName.STRATEGY_IDEA_AGENT)
         self._stock_report_agent = agent_registry.get(AgentName.STOCK_REPORT_AGENT)
 
+    def _work_file_path(self, file_path: str) -> str:
+        # Tools only touch files of this registry's workspace, whatever directory the LLM names
+        return os.path.join(self._work_dir, os.path.basename(file_path))
+
     def register_tools(self):
         self.__register_create_stock_data()
+        self.__register_create_stock_universe_data()
         self.__register_search_ideas_from_web()
         self.__register_execute_backtesting_strategy()
+        self.__register_execute_walk_forward_backtest()
 
     def __register_create_stock_data(self):
         @self._user_proxy.register_for_execution()
         @self._stock_analysis_agent.register_for_llm(
             description="Create stock price data from a file path or API."
         )
+        @self._tool
         def create_stock_data(
             ticker: Annotated[str, "Stock symbol to analyze"] = "MSFT",
             start_date: Annotated[
@@ -40,10 +78,30 @@ class ToolRegistry:
                 str, "End date in format YYYY-MM-DD"
             ] = datetime.today().strftime("%Y-%m-%d"),
         ) -> str:
-            price_data_file_path = os.path.join(WORK_DIR, DATASET_STOCK)
-            fetch_stock_data(ticker, start_date, end_date, price_data_file_path)
+            # Fetched once per ticker and date range, then linked read-only into the workspace
+            price_data_file_path = link_stock_data(
+                ticker, start_date, end_date, self._work_dir
+            )
             return f"Stock data loaded from {price_data_file_path}"
 
+    def __register_create_stock_universe_data(self):
+        @self._user_proxy.register_for_execution()
+        @self._stock_analysis_agent.register_for_llm(
+            description="Download price data for several stock symbols at once into the local price store."
+        )
+        @self._tool
+        def create_stock_universe_data(
+            tickers: Annotated[str, "Comma-separated stock symbols, e.g. 'MSFT,AAPL,NVDA'"],
+            start_date: Annotated[str, "Start date in format YYYY-MM-DD"],
+            end_date: Annotated[
+                str, "End date in format YYYY-MM-DD"
+            ] = datetime.today().strftime("%Y-%m-%d"),
+        ) -> str:
+            try:
+                return fetch_stock_universe(tickers, start_date, end_date)
+            except Exception as e:
+                return f"Error downloading stock universe data: {str(e)}"
+
     def __register_search_ideas_from_web(self):
         @self._user_proxy.register_for_execution()
         @self._stock_analysis_agent.register_for_llm(
@@ -52,6 +110,7 @@ class ToolRegistry:
         @self._custom_signal_analysis_agent.register_for_llm(
             description="Search for examples of using the `ta` library on the web."
         )
+        @self._tool
         def search_ideas_from_web(
             search_query_str: Annotated[str, "Search query for web search"]
         ) -> str:
@@ -69,6 +128,7 @@ class ToolRegistry:
         @self._stock_analysis_agent.register_for_llm(
             description="Execute a backtesting strategy based on buy/sell signals."
         )
+        @self._tool
         def execute_backtesting_strategy(
             stock_price_file_path: Annotated[str, "Stock price data file path"],
             stock_signals_file_path: Annotated[
@@ -77,12 +137,43 @@ class ToolRegistry:
         ) -> BacktestPerformanceMetrics:
             try:
                 backtest_performance_metrics = backtest_stock_strategy(
-                    stock_price_file_path, stock_signals_file_path
+                    self._work_file_path(stock_price_file_path),
+                    self._work_file_path(stock_signals_file_path),
+                    work_dir=self._work_dir,
                 )
                 return backtest_performance_metrics
             except Exception as e:
                 return f"Error executing backtesting strategy: {str(e)}"
 
+    def __register_execute_walk_forward_backtest(self):
+        @self._user_proxy.register_for_execution()
+        @self._stock_analysis_agent.register_for_llm(
+            description="Execute a walk-forward backtest with metrics per rolling train/test window."
+        )
+        @self._tool
+        def execute_walk_forward_backtest(
+            stock_price_file_path: Annotated[str, "Stock price data file path"],
+            stock_signals_file_path: Annotated[
+                str, "Stock buy/sell signal data file path"
+            ],
+            train_bars: Annotated[
+                int, "Number of trading days in each train window"
+            ] = 756,
+            test_bars: Annotated[int, "Number of trading days in each test window"] = 252,
+        ) -> str:
+            try:
+                walk_forward_results = walk_forward_backtest(
+                    self._work_file_path(stock_price_file_path),
+                    self._work_file_path(stock_signals_file_path),
+                    train_bars=train_bars,
+                    test_bars=test_bars,
+                )
+                if isinstance(walk_forward_results, str):
+                    return walk_forward_results
+                return walk_forward_results.to_string(index=False, float_format="{:.4f}".format)
+            except Exception as e:
+                return f"Error executing walk-forward backtest: {str(e)}"
+
 
 class JsonToolRegistry:
     def __init__(
@@ -134,10 +225,16 @@ class JsonToolRegistry:
 
 class PlotToolRegistry:
     def __init__(
-        self, user_proxy: ConversableAgent, stock_report_agent: ConversableAgent
+        self,
+        user_proxy: ConversableAgent,
+        stock_report_agent: ConversableAgent,
+        work_dir: str = WORK_DIR,
+        async_tools: bool = False,
     ):
         self._user_proxy = user_proxy
         self._stock_report_agent = stock_report_agent
+        self._work_dir = work_dir
+        self._tool = to_thread_tool if async_tools else _identity
 
     def register_tools(self):
         self.__register_stock_plot()
@@ -147,10 +244,11 @@ class PlotToolRegistry:
         @self._stock_report_agent.register_for_llm(
             description="Plot stock performance data."
         )
+        @self._tool
         def create_stock_perf_plot() -> str:
             # Plot the stock data
             try:
-                plot_backtest_results()
+                plot_backtest_results(self._work_dir)
                 return "Stock performance plot created."
             except Exception as e:
                 return f"Error creating stock performance plot: {str(e)}"
@@ -0,0 +1,152 @@
+import itertools
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import ta
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+from .functions import Backtester
+from .price_store import read_price_csv
+from .shared_data import attach_price_arrays, publish_price_arrays
+
+# A signal function receives a copy of the price DataFrame plus one parameter
+# combination and returns it with `BuySignal`/`SellSignal` columns, mirroring
+# the `generate_signals()` code produced by the signal analysis agent.
+SignalFunction = Callable[..., pd.DataFrame]
+
+# Per-process state, populated once by `_init_worker`. Pool workers attach to
+# memory-mapped price arrays, so the data is neither pickled nor parsed per worker.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    price_source: Union[pd.DataFrame, str], signal_func: SignalFunction
+) -> None:
+    if isinstance(price_source, str):
+        price_data = attach_price_arrays(price_source).to_frame()
+    else:
+        price_data = price_source
+    _worker_state["price_data"] = price_data
+    _worker_state["signal_func"] = signal_func
+    # The backtester adds columns to its frame, so give it its own (shallow) copy
+    _worker_state["backtester"] = Backtester(price_data.copy(deep=False))
+
+
+def _evaluate_chunk(param_chunk: List[Dict[str, Any]]) -> pd.DataFrame:
+    price_data: pd.DataFrame = _worker_state["price_data"]
+    signal_func: SignalFunction = _worker_state["signal_func"]
+    backtester: Backtester = _worker_state["backtester"]
+
+    buy_signals = np.empty((len(price_data), len(param_chunk)), dtype=bool)
+    sell_signals = np.empty_like(buy_signals)
+    for i, params in enumerate(param_chunk):
+        # Shallow copy: signal columns added by the function never touch the shared frame
+        signals = signal_func(price_data.copy(deep=False), **params)
+        buy_signals[:, i] = signals["BuySignal"].fillna(False).astype(bool)
+        sell_signals[:, i] = signals["SellSignal"].fillna(False).astype(bool)
+
+    metrics = backtester.backtest_signal_matrix(buy_signals, sell_signals)
+    return pd.concat(
+        [pd.DataFrame(param_chunk), metrics.reset_index(drop=True)], axis=1
+    )
+
+
+class ParameterSweep:
+    """
+    Evaluate a signal function over every combination of a parameter grid.
+
+    Combinations are split into chunks and scored on a process pool; each chunk
+    is backtested with `Backtester.backtest_signal_matrix`, so the per-task cost
+    is dominated by signal generation rather than by the backtest itself.
+    """
+
+    def __init__(
+        self,
+        signal_func: SignalFunction,
+        param_grid: Dict[str, List[Any]],
+        param_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        max_workers: Optional[int] = None,
+        chunks_per_worker: int = 4,
+    ):
+        self.signal_func = signal_func
+        self.param_grid = param_grid
+        self.param_filter = param_filter
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+
+    def expand_grid(self) -> List[Dict[str, Any]]:
+        names = list(self.param_grid.keys())
+        combinations = [
+            dict(zip(names, values))
+            for values in itertools.product(*self.param_grid.values())
+        ]
+        if self.param_filter is not None:
+            combinations = [c for c in combinations if self.param_filter(c)]
+        return combinations
+
+    def run(
+        self,
+        price_data: pd.DataFrame,
+        rank_by: str = "sharpe_ratio",
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        combinations = self.expand_grid()
+        if not combinations:
+            raise ValueError("The parameter grid has no combinations to evaluate.")
+
+        n_chunks = min(len(combinations), self.max_workers * self.chunks_per_worker)
+        chunks = [
+            list(chunk)
+            for chunk in np.array_split(np.array(combinations, dtype=object), n_chunks)
+        ]
+
+        if self.max_workers == 1:
+            _init_worker(price_data, self.signal_func)
+            results = [_evaluate_chunk(chunk) for chunk in chunks]
+        else:
+            with tempfile.TemporaryDirectory() as shared_dir:
+                publish_price_arrays(price_data, shared_dir)
+                with ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(shared_dir, self.signal_func),
+                ) as executor:
+                    results = list(executor.map(_evaluate_chunk, chunks))
+
+        table = pd.concat(results, ignore_index=True)
+        table = table.sort_values(rank_by, ascending=ascending, ignore_index=True)
+        table.insert(0, "rank", np.arange(1, len(table) + 1))
+        return table
+
+
+def moving_average_crossover(
+    df: pd.DataFrame, short_window: int, long_window: int
+) -> pd.DataFrame:
+    short_ma = ta.trend.sma_indicator(df["Adj Close"], window=short_window)
+    long_ma = ta.trend.sma_indicator(df["Adj Close"], window=long_window)
+    df["BuySignal"] = short_ma > long_ma
+    df["SellSignal"] = short_ma < long_ma
+    return df
+
+
+def rsi_reversal(
+    df: pd.DataFrame, window: int, oversold: float, overbought: float
+) -> pd.DataFrame:
+    rsi = ta.momentum.rsi(df["Adj Close"], window=window)
+    df["BuySignal"] = rsi < oversold
+    df["SellSignal"] = rsi > overbought
+    return df
+
+
+def sweep_stock_strategy(
+    stock_price_file_path: str,
+    signal_func: SignalFunction,
+    param_grid: Dict[str, List[Any]],
+    param_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    max_workers: Optional[int] = None,
+    rank_by: str = "sharpe_ratio",
+) -> pd.DataFrame:
+    price_data = read_price_csv(stock_price_file_path)
+    sweep = ParameterSweep(signal_func, param_grid, param_filter, max_workers)
+    return sweep.run(price_data, rank_by=rank_by)
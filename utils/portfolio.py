@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from typing import Callable, Dict, List, Optional
+from .datamodels import PortfolioBacktestResult
+from .functions import PerformanceMetricsCalculator, Position, simulate_signal_matrix
+from .price_store import read_price_csv
+
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class PanelDataHandler:
+    """
+    Load OHLCV data for a universe of tickers as panels: one dates x tickers
+    DataFrame per price field, aligned on a common date index.
+    """
+
+    def __init__(self, tickers: List[str], start_date: str, end_date: str):
+        self.tickers = tickers
+        self.start_date = start_date
+        self.end_date = end_date
+        self.panels: Optional[Dict[str, pd.DataFrame]] = None
+
+    def fetch_data(self) -> Dict[str, pd.DataFrame]:
+        data = yf.download(
+            self.tickers,
+            start=self.start_date,
+            end=self.end_date,
+            group_by="column",
+            auto_adjust=False,
+        )
+        self.panels = {
+            field: data[field].reindex(columns=self.tickers).astype(np.float64)
+            for field in PANEL_FIELDS
+        }
+        return self.panels
+
+    def load_data_from_csv(self, file_paths: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        # Per-ticker files in the `stock_data.csv` layout (OHLCV columns + Date)
+        frames = {
+            ticker: read_price_csv(file_path) for ticker, file_path in file_paths.items()
+        }
+        self.panels = self.frames_to_panels(frames)
+        return self.panels
+
+    @staticmethod
+    def frames_to_panels(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        dates = pd.DatetimeIndex([])
+        for frame in frames.values():
+            dates = dates.union(frame.index)
+        return {
+            field: pd.DataFrame(
+                {ticker: frame[field] for ticker, frame in frames.items()},
+                index=dates,
+                dtype=np.float64,
+            )
+            for field in PANEL_FIELDS
+        }
+
+
+class PortfolioBacktester:
+    """
+    Backtest the same signal logic across a universe of tickers.
+
+    Prices and signals are dates x tickers panels. Each ticker is simulated with
+    the single-ticker `Backtester` rules; the portfolio holds every ticker with a
+    price on a given bar at its (renormalised) weight and is rebalanced daily.
+    Tickers are processed in blocks of `chunk_size` columns so peak memory is
+    bounded by the block size rather than by the size of the universe.
+    """
+
+    def __init__(self, panels: Dict[str, pd.DataFrame], chunk_size: int = 100):
+        self.adj_close = panels["Adj Close"]
+        self.open = panels["Open"].reindex_like(self.adj_close)
+        self.close = panels["Close"].reindex_like(self.adj_close)
+        self.panels = panels
+        self.chunk_size = chunk_size
+
+    def generate_signals(
+        self, signal_func: Callable[[pd.DataFrame], pd.DataFrame]
+    ) -> Dict[str, pd.DataFrame]:
+        # Run a per-ticker signal function, e.g. a `generate_signals` body that
+        # adds `BuySignal`/`SellSignal` columns to a single-ticker OHLCV frame
+        buy_signals, sell_signals = {}, {}
+        for ticker in self.adj_close.columns:
+            frame = pd.DataFrame(
+                {field: panel[ticker] for field, panel in self.panels.items()}
+            )
+            signals = signal_func(frame)
+            buy_signals[ticker] = signals["BuySignal"].fillna(False).astype(bool)
+            sell_signals[ticker] = signals["SellSignal"].fillna(False).astype(bool)
+        return {
+            "BuySignal": pd.DataFrame(buy_signals, index=self.adj_close.index),
+            "SellSignal": pd.DataFrame(sell_signals, index=self.adj_close.index),
+        }
+
+    def backtest(
+        self,
+        buy_signals: pd.DataFrame,
+        sell_signals: pd.DataFrame,
+        weights: Optional[Dict[str, float]] = None,
+        risk_free_rate: float = 0.02,
+        equity_dtype: np.dtype = np.float32,
+    ) -> PortfolioBacktestResult:
+        tickers = list(self.adj_close.columns)
+        buy_signals = buy_signals.reindex_like(self.adj_close).fillna(False)
+        sell_signals = sell_signals.reindex_like(self.adj_close).fillna(False)
+        ticker_weights = np.array(
+            [1.0 if weights is None else weights.get(ticker, 0.0) for ticker in tickers]
+        )
+
+        n_bars, n_tickers = self.adj_close.shape
+        equity_curves = np.empty((n_bars, n_tickers), dtype=equity_dtype)
+        weighted_returns = np.zeros(n_bars)
+        # Only tickers with a price on a bar take part in the portfolio
+        listed_weight = (self.adj_close.notna().to_numpy() * ticker_weights).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            allocation_scale = np.where(listed_weight > 0, 1 / listed_weight, 0)
+        # Share of the portfolio in tickers holding a position, and the bar to
+        # bar change of each ticker's share, for exposure and turnover
+        invested_share = np.zeros(n_bars)
+        allocation_changes = np.zeros(n_bars)
+        metrics: Dict[str, np.ndarray] = {}
+
+        for start in range(0, n_tickers, self.chunk_size):
+            block = slice(start, start + self.chunk_size)
+            adj_close = self.adj_close.iloc[:, block]
+            returns = adj_close.ffill().pct_change().fillna(0).to_numpy()
+            open_returns = (
+                (self.open.iloc[:, block] / self.close.iloc[:, block].shift(1) - 1)
+                .fillna(0)
+                .to_numpy()
+            )
+
+            adjusted_position, adjusted_returns = simulate_signal_matrix(
+                buy_signals.iloc[:, block].to_numpy().astype(int),
+                sell_signals.iloc[:, block].to_numpy().astype(int),
+                returns,
+                open_returns,
+            )
+            # Bars up to a ticker's first price are treated like the first bar
+            # of a single-ticker backtest, so late listings keep their own history
+            listed = adj_close.notna().cummax()
+            adjusted_position[~listed.shift(1, fill_value=False).to_numpy()] = 0
+            cumulative_returns = (
+                PerformanceMetricsCalculator.calculate_cumulative_returns(
+                    adjusted_returns
+                )
+            )
+            equity_curves[:, block] = cumulative_returns
+
+            block_metrics = PerformanceMetricsCalculator.calculate_risk_statistics(
+                adjusted_returns,
+                adjusted_position,
+                cumulative_returns=cumulative_returns,
+                risk_free_rate=risk_free_rate,
+                n_bars=listed.sum(axis=0).to_numpy(),
+            )
+            for name, values in block_metrics.items():
+                metrics.setdefault(name, np.empty(n_tickers))[block] = values
+
+            active_weights = adj_close.notna().to_numpy() * ticker_weights[block]
+            weighted_returns += (adjusted_returns * active_weights).sum(axis=1)
+            invested = np.isin(adjusted_position, [Position.BUY, Position.HOLD, Position.SELL])
+            allocation = invested * active_weights * allocation_scale.reshape(-1, 1)
+            invested_share += allocation.sum(axis=1)
+            allocation_changes[1:] += np.abs(np.diff(allocation, axis=0)).sum(axis=1)
+
+        portfolio_returns = weighted_returns * allocation_scale
+        portfolio_equity = PerformanceMetricsCalculator.calculate_cumulative_returns(
+            portfolio_returns.reshape(-1, 1)
+        )
+        # Every bar after the first counts for Sharpe and Sortino, as the cash
+        # share earns 0 like a flat single ticker; bars where no ticker holds a
+        # position are not invested for the win rate
+        portfolio_position = np.where(
+            invested_share > 0, Position.HOLD, Position.NO_HOLD
+        ).reshape(-1, 1)
+        portfolio_position[0] = 0
+        portfolio_metrics = PerformanceMetricsCalculator.calculate_risk_statistics(
+            portfolio_returns.reshape(-1, 1),
+            portfolio_position,
+            cumulative_returns=portfolio_equity,
+            risk_free_rate=risk_free_rate,
+        )
+        # Exposure and turnover are weighted by the tickers' shares, so a single
+        # ticker portfolio matches that ticker's statistics
+        portfolio_metrics["exposure"] = np.array([invested_share.mean()])
+        portfolio_metrics["turnover"] = np.array([allocation_changes.sum() / (n_bars / 252)])
+
+        return PortfolioBacktestResult(
+            ticker_metrics=pd.DataFrame(
+                metrics, index=pd.Index(tickers, name="ticker")
+            ),
+            portfolio_metrics={
+                name: float(values[0]) for name, values in portfolio_metrics.items()
+            },
+            equity_curves=pd.DataFrame(
+                equity_curves, index=self.adj_close.index, columns=tickers
+            ),
+            portfolio_equity=pd.Series(
+                portfolio_equity[:, 0], index=self.adj_close.index, name="Portfolio"
+            ),
+        )
@@ -0,0 +1,244 @@
+import importlib.util
+import json
+import os
+import re
+import pandas as pd
+import yfinance as yf
+from datetime import datetime, timedelta
+from pandas.tseries.holiday import GoodFriday, USFederalHolidayCalendar
+from typing import Dict, List, Optional, Tuple
+from .const import PRICE_STORE_DIR
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+# The pyarrow CSV reader is multi-threaded and parses floats exactly
+_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# A covered date range [start, end) as "YYYY-MM-DD" strings; `end` is exclusive
+# like the `end` argument of `yf.download`.
+DateRange = Tuple[str, str]
+
+
+def read_price_csv(file_path: str, price_dtype: str = "float64") -> pd.DataFrame:
+    """
+    Read a `stock_data.csv` style file with explicit dtypes and a parsed `Date`
+    index, validating the schema once so later stages can skip coercion.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    missing = [c for c in [*PRICE_COLUMNS, "Date"] if c not in header]
+    if missing:
+        raise ValueError(f'Price file "{file_path}" is missing columns: {missing}')
+
+    dtype = {column: price_dtype for column in PRICE_COLUMNS}
+    # float64 rather than int64, so bars with a missing volume still parse
+    dtype["Volume"] = "float64"
+    try:
+        df = pd.read_csv(
+            file_path,
+            usecols=[*PRICE_COLUMNS, "Date"],
+            dtype=dtype,
+            parse_dates=["Date"],
+            engine=_CSV_ENGINE,
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Price file "{file_path}" has invalid values: {e}') from e
+
+    if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        raise ValueError(f'Price file "{file_path}" has unparseable dates.')
+    df = df.set_index("Date")
+    if df.index.has_duplicates:
+        raise ValueError(f'Price file "{file_path}" has duplicate dates.')
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df[PRICE_COLUMNS]
+
+
+class PriceDownloadError(RuntimeError):
+    pass
+
+
+def has_trading_days(start_date: str, end_date: str) -> bool:
+    # Weekdays in [start, end) minus US market holidays (federal holidays
+    # plus Good Friday), i.e. days an exchange is expected to report bars for
+    last_day = pd.Timestamp(end_date) - timedelta(days=1)
+    days = pd.bdate_range(start_date, last_day)
+    holidays = USFederalHolidayCalendar().holidays(start_date, last_day)
+    holidays = holidays.union(GoodFriday.dates(start_date, last_day))
+    return len(days.difference(holidays)) > 0
+
+
+class PriceDataProvider:
+    """Source of daily OHLCV bars for one ticker, indexed by `Date`."""
+
+    def fetch(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YahooPriceProvider(PriceDataProvider):
+    def fetch(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        data = yf.download(
+            ticker,
+            start=start_date,
+            end=end_date,
+            auto_adjust=False,
+            progress=False,
+        )
+        # Newer yfinance versions return (field, ticker) columns even for one ticker
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        data = data.reindex(columns=PRICE_COLUMNS).dropna(how="all")
+        # yfinance only logs failed downloads and returns an empty frame, so a
+        # range that should have bars but has none is a failure, not coverage
+        if data.empty and has_trading_days(start_date, end_date):
+            raise PriceDownloadError(
+                f"No price data returned for {ticker} between {start_date} and {end_date}"
+            )
+        return data
+
+
+class FixturePriceProvider(PriceDataProvider):
+    """
+    Offline provider serving bars from in-memory frames, e.g. for tests.
+    Every call is recorded in `calls` so callers can check what was fetched.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+        self.calls: List[Tuple[str, str, str]] = []
+
+    @classmethod
+    def from_csv(cls, file_paths: Dict[str, str]) -> "FixturePriceProvider":
+        # Per-ticker files in the `stock_data.csv` layout (OHLCV columns + Date)
+        return cls(
+            {ticker: read_price_csv(file_path) for ticker, file_path in file_paths.items()}
+        )
+
+    def fetch(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        self.calls.append((ticker, start_date, end_date))
+        frame = self.frames.get(ticker)
+        if frame is None:
+            return pd.DataFrame(
+                columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date")
+            )
+        mask = (frame.index >= start_date) & (frame.index < end_date)
+        return frame.loc[mask, PRICE_COLUMNS]
+
+
+def _merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _missing_ranges(
+    covered: List[DateRange], start_date: str, end_date: str
+) -> List[DateRange]:
+    missing: List[DateRange] = []
+    cursor = start_date
+    for start, end in covered:
+        if end <= cursor:
+            continue
+        if start >= end_date:
+            break
+        if start > cursor:
+            missing.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < end_date:
+        missing.append((cursor, end_date))
+    return missing
+
+
+class PriceStore:
+    """
+    Per-ticker Parquet cache of daily prices.
+
+    Each ticker has a `<ticker>.parquet` file with its bars and a
+    `<ticker>.json` file listing the date ranges already requested from the
+    provider, so weekends and holidays are not re-fetched. `get` only downloads
+    the parts of a request that are not covered yet, merges them into the file
+    and serves the slice from an in-memory copy.
+    """
+
+    def __init__(
+        self,
+        store_dir: str = PRICE_STORE_DIR,
+        provider: Optional[PriceDataProvider] = None,
+    ):
+        self.store_dir = store_dir
+        self.provider = provider or YahooPriceProvider()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._ranges: Dict[str, List[DateRange]] = {}
+
+    def _file_stem(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, re.sub(r"[^A-Za-z0-9._-]", "_", ticker))
+
+    def _load(self, ticker: str) -> None:
+        if ticker in self._frames:
+            return
+        stem = self._file_stem(ticker)
+        if os.path.exists(f"{stem}.parquet") and os.path.exists(f"{stem}.json"):
+            self._frames[ticker] = pd.read_parquet(f"{stem}.parquet")
+            with open(f"{stem}.json", "r", encoding="utf-8") as f:
+                self._ranges[ticker] = [tuple(r) for r in json.load(f)["ranges"]]
+        else:
+            self._frames[ticker] = pd.DataFrame(
+                columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date")
+            )
+            self._ranges[ticker] = []
+
+    def _save(self, ticker: str) -> None:
+        os.makedirs(self.store_dir, exist_ok=True)
+        stem = self._file_stem(ticker)
+        # Write to temporary files first so a crash never leaves a torn cache
+        self._frames[ticker].to_parquet(f"{stem}.parquet.tmp")
+        with open(f"{stem}.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({"ticker": ticker, "ranges": self._ranges[ticker]}, f)
+        os.replace(f"{stem}.parquet.tmp", f"{stem}.parquet")
+        os.replace(f"{stem}.json.tmp", f"{stem}.json")
+
+    def covered_ranges(self, ticker: str) -> List[DateRange]:
+        self._load(ticker)
+        return list(self._ranges[ticker])
+
+    def missing_ranges(
+        self, ticker: str, start_date: str, end_date: str
+    ) -> List[DateRange]:
+        self._load(ticker)
+        return _missing_ranges(self._ranges[ticker], start_date, end_date)
+
+    def add(
+        self, ticker: str, frames: List[pd.DataFrame], ranges: List[DateRange]
+    ) -> None:
+        # Merge bars fetched for `ranges` and record those ranges as covered
+        self._load(ticker)
+        parts = [f for f in [self._frames[ticker], *frames] if not f.empty]
+        if parts:
+            frame = pd.concat(parts)
+            frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            frame.index.name = "Date"
+            self._frames[ticker] = frame
+
+        # Today's bar may still change, so coverage stops before today
+        today = datetime.today().strftime("%Y-%m-%d")
+        covered = [(start, min(end, today)) for start, end in ranges]
+        self._ranges[ticker] = _merge_ranges(
+            self._ranges[ticker] + [r for r in covered if r[0] < r[1]]
+        )
+        self._save(ticker)
+
+    def get(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        # A provider error leaves every missing range unrecorded, so it is retried
+        missing = self.missing_ranges(ticker, start_date, end_date)
+        if missing:
+            fetched = [
+                self.provider.fetch(ticker, start, end) for start, end in missing
+            ]
+            self.add(ticker, fetched, missing)
+
+        frame = self._frames[ticker]
+        end = pd.Timestamp(end_date) - timedelta(days=1)
+        return frame.loc[start_date:end].copy()
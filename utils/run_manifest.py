@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+from .const import (
+    BACKTEST_RESULTS_FILE,
+    CHAT_SUMMARY_FILE_NAME,
+    DATASET_SIGNALS,
+    DATASET_STOCK,
+    PLOT_FILE_NAME,
+    RUN_MANIFEST_FILE,
+    WORK_DIR,
+)
+
+# Stages of one strategy run in order, with the file each one produces
+STAGE_ARTIFACTS = {
+    "data": DATASET_STOCK,
+    "signals": DATASET_SIGNALS,
+    "backtest": BACKTEST_RESULTS_FILE,
+    "plot": PLOT_FILE_NAME,
+    "summary": CHAT_SUMMARY_FILE_NAME,
+}
+STAGES = list(STAGE_ARTIFACTS)
+
+
+def file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def strategy_run_key(
+    strategy_idea: Dict[str, Any],
+    ticker: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> str:
+    """Hash of the strategy idea and the price data it runs on."""
+    key = {
+        "strategy_idea": strategy_idea,
+        "ticker": ticker,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class RunManifest:
+    """
+    SQLite record of the stages each strategy run completed, with the path and
+    SHA-256 of the artifact a stage produced. A stage only counts as done while
+    its artifact is still on disk with the recorded hash, so a restarted
+    workflow resumes after the last intact stage.
+    """
+
+    def __init__(self, db_path: str = os.path.join(WORK_DIR, RUN_MANIFEST_FILE)):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stages (
+                    run_key TEXT NOT NULL,
+                    strategy TEXT,
+                    stage TEXT NOT NULL,
+                    artifact TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    note TEXT,
+                    completed_at TEXT NOT NULL,
+                    PRIMARY KEY (run_key, stage)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per call, so async strategies can record from threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(
+        self,
+        run_key: str,
+        strategy: Optional[str],
+        stage: str,
+        artifact_path: str,
+        note: Optional[str] = None,
+    ) -> bool:
+        """Record `stage` as done if its artifact exists; a `note` is kept until replaced."""
+        if stage not in STAGE_ARTIFACTS:
+            raise ValueError(f"Unknown stage: {stage}. Use one of {STAGES}.")
+        if not os.path.exists(artifact_path):
+            return False
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO stages (run_key, strategy, stage, artifact, sha256, note, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_key, stage) DO UPDATE SET
+                    strategy = excluded.strategy,
+                    artifact = excluded.artifact,
+                    sha256 = excluded.sha256,
+                    note = COALESCE(excluded.note, stages.note),
+                    completed_at = excluded.completed_at
+                """,
+                (
+                    run_key,
+                    strategy,
+                    stage,
+                    artifact_path,
+                    file_sha256(artifact_path),
+                    note,
+                    datetime.now().isoformat(),
+                ),
+            )
+        return True
+
+    def completed_stages(self, run_key: str) -> Dict[str, Dict[str, Any]]:
+        """Recorded stages whose artifact is unchanged on disk."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM stages WHERE run_key = ?", (run_key,)).fetchall()
+        return {
+            row["stage"]: dict(row)
+            for row in rows
+            if os.path.exists(row["artifact"]) and file_sha256(row["artifact"]) == row["sha256"]
+        }
+
+    def is_finished(self, run_key: str) -> bool:
+        return set(STAGES) <= self.completed_stages(run_key).keys()
+
+    def checkpoint(
+        self,
+        strategy_idea: Dict[str, Any],
+        ticker: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> "StrategyCheckpoint":
+        run_key = strategy_run_key(strategy_idea, ticker, start_date, end_date)
+        return StrategyCheckpoint(self, run_key, strategy_idea.get("strategy"))
+
+
+class StrategyCheckpoint:
+    """The manifest entries of one strategy run, as they were when the run started."""
+
+    def __init__(self, manifest: RunManifest, run_key: str, strategy: Optional[str]):
+        self.manifest = manifest
+        self.run_key = run_key
+        self.strategy = strategy
+        self.completed = manifest.completed_stages(run_key)
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.completed
+
+    def note(self, stage: str) -> Optional[str]:
+        return self.completed.get(stage, {}).get("note")
+
+    def record(self, dir_path: str, stages: Iterable[str], note: Optional[str] = None) -> None:
+        """Record the given stages whose artifacts are present in `dir_path`."""
+        for stage in stages:
+            artifact_path = os.path.join(dir_path, STAGE_ARTIFACTS[stage])
+            self.manifest.record(self.run_key, self.strategy, stage, artifact_path, note)
+
+    def is_finished(self) -> bool:
+        return self.manifest.is_finished(self.run_key)
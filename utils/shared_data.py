@@ -0,0 +1,150 @@
+import json
+import os
+import re
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from .price_store import read_price_csv
+
+SHARED_META_FILE = "meta.json"
+SHARED_FORMAT_VERSION = 1
+
+
+def _column_file_name(column: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", column) + ".npy"
+
+
+def publish_price_arrays(df: pd.DataFrame, directory: str) -> str:
+    """
+    Write each column of a price frame to `<directory>/<column>.npy` plus a
+    `meta.json` header, so other processes can memory-map them without parsing.
+    A `Date` column or DatetimeIndex is stored as int64 nanoseconds.
+
+    The arrays are written to a sibling directory that then replaces
+    `directory`, so a republish never rewrites files a reader has mapped or
+    pairs an old `meta.json` with new arrays.
+    """
+    tmp_dir = f"{directory}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    frame = df.reset_index() if isinstance(df.index, pd.DatetimeIndex) else df
+
+    columns: List[Dict[str, str]] = []
+    for column in frame.columns:
+        values = frame[column]
+        if column == "Date":
+            values = pd.to_datetime(values)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            array = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            kind = "datetime"
+        elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            array = values.to_numpy()
+            kind = "numeric"
+        else:
+            # Strings are not worth sharing; the price columns are all numeric
+            continue
+        file_name = _column_file_name(column)
+        np.save(os.path.join(tmp_dir, file_name), array)
+        columns.append(
+            {"name": column, "file": file_name, "dtype": str(array.dtype), "kind": kind}
+        )
+
+    meta = {
+        "version": SHARED_FORMAT_VERSION,
+        "n_bars": len(frame),
+        "columns": columns,
+    }
+    # The header is written last, so its presence means every array is complete
+    with open(os.path.join(tmp_dir, SHARED_META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    _replace_directory(tmp_dir, directory)
+    return directory
+
+
+def _replace_directory(src: str, dest: str) -> None:
+    # `os.replace` only swaps a directory onto a missing or empty one, so the
+    # old directory is moved aside first; open memory maps of its files stay valid
+    old_dir = f"{src}.old"
+    try:
+        os.replace(dest, old_dir)
+    except FileNotFoundError:
+        pass
+    try:
+        os.replace(src, dest)
+    except OSError:
+        # A concurrent publisher put its complete directory in place first
+        shutil.rmtree(src, ignore_errors=True)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+class SharedPriceArrays:
+    """
+    Read-only, zero-copy view of price columns published by `publish_price_arrays`.
+    Arrays are memory-mapped, so every process attached to the same directory
+    shares the page cache instead of holding its own parsed copy.
+    """
+
+    def __init__(self, directory: str):
+        meta_path = os.path.join(directory, SHARED_META_FILE)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != SHARED_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported shared price format version: {self.meta.get('version')}"
+            )
+        self.directory = directory
+        self.n_bars: int = self.meta["n_bars"]
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._kinds: Dict[str, str] = {}
+        for column in self.meta["columns"]:
+            self.arrays[column["name"]] = np.load(
+                os.path.join(directory, column["file"]), mmap_mode="r"
+            )
+            self._kinds[column["name"]] = column["kind"]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.arrays.keys())
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.arrays[column]
+
+    def _column(self, column: str) -> np.ndarray:
+        array = self.arrays[column]
+        if self._kinds[column] == "datetime":
+            return array.view("datetime64[ns]")
+        return array
+
+    def to_frame(
+        self, columns: Optional[List[str]] = None, index: Optional[str] = None
+    ) -> pd.DataFrame:
+        # `copy=False` keeps each numeric column backed by its memory map;
+        # `set_index` would copy, so the index column is passed in directly
+        columns = [c for c in columns or self.columns if c != index]
+        return pd.DataFrame(
+            {column: self._column(column) for column in columns},
+            index=pd.Index(self._column(index), name=index) if index else None,
+            copy=False,
+        )
+
+
+def attach_price_arrays(directory: str) -> SharedPriceArrays:
+    return SharedPriceArrays(directory)
+
+
+def load_price_frame(file_path: str, shared_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Attach to the published arrays for `file_path` when they exist and are not
+    older than the file, otherwise fall back to parsing the CSV. Either way the
+    frame has the `read_price_csv` layout with a `Date` index.
+    """
+    shared_dir = shared_dir or f"{os.path.splitext(file_path)[0]}.shared"
+    meta_path = os.path.join(shared_dir, SHARED_META_FILE)
+    if os.path.exists(meta_path) and (
+        not os.path.exists(file_path)
+        or os.path.getmtime(meta_path) >= os.path.getmtime(file_path)
+    ):
+        return attach_price_arrays(shared_dir).to_frame(index="Date")
+    return read_price_csv(file_path)
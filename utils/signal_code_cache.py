@@ -0,0 +1,132 @@
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import click
+from autogen.code_utils import PYTHON_VARIANTS, extract_code
+from .const import DATASET_SIGNALS, DATASET_STOCK, SIGNAL_CODE_CACHE_DIR
+from .price_store import PRICE_COLUMNS
+
+# What the generated code may rely on about its input and output files
+DATA_SCHEMA = {
+    "input_file": DATASET_STOCK,
+    "input_columns": PRICE_COLUMNS,
+    "output_file": DATASET_SIGNALS,
+}
+
+
+def signal_code_key(strategy_idea: Dict[str, Any], prompt: str) -> str:
+    """Hash of the strategy idea, the prompt that produced the code and `DATA_SCHEMA`."""
+    key = {"strategy_idea": strategy_idea, "prompt": prompt, "schema": DATA_SCHEMA}
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def last_executed_code(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Last Python code in a chat that the next message reports as executed with
+    exit code 0, i.e. the code `user_proxy` ran successfully.
+    """
+    pending, executed = None, None
+    for message in messages:
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            continue
+        if content.startswith("exitcode: 0") and pending is not None:
+            executed, pending = pending, None
+            continue
+        code_blocks = [
+            code for language, code in extract_code(content) if language in PYTHON_VARIANTS
+        ]
+        if code_blocks:
+            pending = "\n\n".join(code_blocks)
+    return executed
+
+
+class SignalCodeCache:
+    """
+    Signal code that ran successfully, one JSON file per key, so rerunning a
+    workflow can execute it again instead of asking the LLM group chat.
+    """
+
+    def __init__(self, cache_dir: str = SIGNAL_CODE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["code"]
+
+    def put(self, key: str, strategy_idea: Dict[str, Any], code: str) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "key": key,
+                    "strategy": strategy_idea.get("strategy"),
+                    "strategy_idea": strategy_idea,
+                    "created_at": datetime.now().isoformat(),
+                    "code": code,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(f"{path}.tmp", path)
+        return path
+
+    def entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        for path in sorted(glob.glob(self._path("*"))):
+            with open(path, "r", encoding="utf-8") as f:
+                entries.append(json.load(f))
+        return entries
+
+    def invalidate(self, key: Optional[str] = None, strategy: Optional[str] = None) -> int:
+        """Remove entries matching a key prefix and/or a strategy name; all entries if neither is given."""
+        removed = 0
+        for entry in self.entries():
+            if key is not None and not entry["key"].startswith(key):
+                continue
+            if strategy is not None and entry["strategy"] != strategy:
+                continue
+            os.remove(self._path(entry["key"]))
+            removed += 1
+        return removed
+
+
+@click.group()
+def cli():
+    """Manage the signal code cache."""
+
+
+@cli.command("list")
+@click.option("--cache-dir", default=SIGNAL_CODE_CACHE_DIR, show_default=True)
+def list_entries(cache_dir: str):
+    for entry in SignalCodeCache(cache_dir).entries():
+        click.echo(f"{entry['key'][:12]}  {entry['created_at']}  {entry['strategy']}")
+
+
+@cli.command()
+@click.option("--key", default=None, help="Key or key prefix of the entry to remove.")
+@click.option("--strategy", default=None, help="Strategy name of the entries to remove.")
+@click.option("--all", "remove_all", is_flag=True, help="Remove every entry.")
+@click.option("--cache-dir", default=SIGNAL_CODE_CACHE_DIR, show_default=True)
+def invalidate(key: Optional[str], strategy: Optional[str], remove_all: bool, cache_dir: str):
+    """Remove cached signal code so the strategy goes through the group chat again."""
+    if key is None and strategy is None and not remove_all:
+        raise click.UsageError("Pass --key, --strategy or --all.")
+    removed = SignalCodeCache(cache_dir).invalidate(key=key, strategy=strategy)
+    click.echo(f"Removed {removed} cached signal code entries.")
+
+
+if __name__ == "__main__":
+    cli()
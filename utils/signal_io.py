@@ -0,0 +1,112 @@
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+import numpy as np
+import pandas as pd
+from .datamodels import SignalArrayModel
+
+# Layout: magic, format version (uint8), header length (uint32, little endian),
+# UTF-8 JSON header, then one bit-packed array per signal column
+SIGNAL_FILE_MAGIC = b"QSIG"
+SIGNAL_FILE_VERSION = 1
+SIGNAL_COLUMNS = ["BuySignal", "SellSignal"]
+_PREAMBLE = struct.Struct("<4sBI")
+
+ArrayLike = Union[np.ndarray, pd.Series, list]
+
+
+def _to_bool_array(values: ArrayLike) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        values = values.fillna(False)
+    return np.asarray(values).astype(bool)
+
+
+def write_signals(
+    file_path: str,
+    buy_signals: ArrayLike,
+    sell_signals: ArrayLike,
+    description: str,
+    provenance: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Write buy/sell signals as bit-packed arrays with the description and
+    provenance (e.g. the input file and generator) stored once in a JSON header.
+    A `.csv` path keeps the legacy text layout, see `SIGNALS_FORMAT`.
+    """
+    buy, sell = _to_bool_array(buy_signals), _to_bool_array(sell_signals)
+    if len(buy) != len(sell):
+        raise ValueError("Buy and sell signals must have the same length.")
+
+    tmp_file_path = f"{file_path}.tmp"
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        pd.DataFrame(
+            {"BuySignal": buy, "SellSignal": sell, "Description": description}
+        ).to_csv(tmp_file_path, index=False)
+        os.replace(tmp_file_path, file_path)
+        return f'Signals saved to "{file_path}"'
+
+    header = json.dumps(
+        {
+            "n_bars": len(buy),
+            "columns": SIGNAL_COLUMNS,
+            "description": description,
+            "provenance": {"created_at": datetime.now().isoformat(), **(provenance or {})},
+        }
+    ).encode("utf-8")
+    with open(tmp_file_path, "wb") as f:
+        f.write(_PREAMBLE.pack(SIGNAL_FILE_MAGIC, SIGNAL_FILE_VERSION, len(header)))
+        f.write(header)
+        f.write(np.packbits(buy).tobytes())
+        f.write(np.packbits(sell).tobytes())
+    os.replace(tmp_file_path, file_path)
+    return f'Signals saved to "{file_path}"'
+
+
+def is_signal_file(file_path: str) -> bool:
+    with open(file_path, "rb") as f:
+        return f.read(len(SIGNAL_FILE_MAGIC)) == SIGNAL_FILE_MAGIC
+
+
+def read_signal_header(file_path: str) -> Dict[str, Any]:
+    with open(file_path, "rb") as f:
+        magic, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != SIGNAL_FILE_MAGIC:
+            raise ValueError(f'"{file_path}" is not a binary signal file.')
+        if version != SIGNAL_FILE_VERSION:
+            raise ValueError(f"Unsupported signal file version: {version}")
+        return json.loads(f.read(header_length).decode("utf-8"))
+
+
+def read_signals(file_path: str) -> SignalArrayModel:
+    """
+    Read signals written by `write_signals`. Files in the legacy CSV layout
+    (`BuySignal`, `SellSignal`, `Description` columns) are read as well, so
+    either format can sit behind the `DATASET_SIGNALS` path.
+    """
+    if not is_signal_file(file_path):
+        df = pd.read_csv(file_path)
+        return SignalArrayModel(
+            BuySignal=_to_bool_array(df["BuySignal"]),
+            SellSignal=_to_bool_array(df["SellSignal"]),
+            Description=str(df["Description"].iloc[0]),
+        )
+
+    with open(file_path, "rb") as f:
+        _, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if version != SIGNAL_FILE_VERSION:
+            raise ValueError(f"Unsupported signal file version: {version}")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        payload = np.frombuffer(f.read(), dtype=np.uint8)
+    n_bars = header["n_bars"]
+    n_bytes = (n_bars + 7) // 8
+    columns = {
+        name: np.unpackbits(payload[i * n_bytes : (i + 1) * n_bytes], count=n_bars).astype(bool)
+        for i, name in enumerate(header["columns"])
+    }
+    return SignalArrayModel(
+        BuySignal=columns["BuySignal"],
+        SellSignal=columns["SellSignal"],
+        Description=header["description"],
+    )
@@ -0,0 +1,193 @@
+"""
+Declarative buy/sell rules, e.g. "buy when RSI < 30, sell when RSI > 70":
+
+    {
+        "buy": {"lt": ["momentum_rsi", 30]},
+        "sell": {"any": [{"gt": ["momentum_rsi", 70]}, {"cross_below": ["trend_macd", "trend_macd_signal"]}]}
+    }
+
+A condition is one of
+    - {"all": [cond, ...]}, {"any": [cond, ...]}, {"not": cond}
+    - {"gt" | "ge" | "lt" | "le": [operand, operand]}
+    - {"cross_above" | "cross_below": [operand, operand]}
+and an operand is a price column (`PRICE_COLUMNS`), a feature store column
+(`ta.add_all_ta_features` names, see `utils/feature_store.py`) or a number.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Mapping, Set, Union
+import numpy as np
+from .datamodels import SignalArrayModel
+from .feature_store import FeatureStore
+from .price_store import PRICE_COLUMNS, read_price_csv
+from .signal_io import write_signals
+
+COMPARISONS = {
+    "gt": np.greater,
+    "ge": np.greater_equal,
+    "lt": np.less,
+    "le": np.less_equal,
+}
+CROSSOVERS = ("cross_above", "cross_below")
+
+Columns = Mapping[str, np.ndarray]
+Evaluator = Callable[[Columns], Any]
+
+
+class SignalRuleError(ValueError):
+    pass
+
+
+def _compile_operand(operand: Any) -> Evaluator:
+    if isinstance(operand, bool) or not isinstance(operand, (str, int, float)):
+        raise SignalRuleError(f"Invalid operand: {operand!r}")
+    if isinstance(operand, str):
+        return lambda columns: columns[operand]
+    value = float(operand)
+    return lambda columns: value
+
+
+def _operands(op: str, args: Any) -> Any:
+    if not isinstance(args, list) or len(args) != 2:
+        raise SignalRuleError(f'"{op}" expects a list of two operands, got {args!r}')
+    if not any(isinstance(arg, str) for arg in args):
+        raise SignalRuleError(f'"{op}" needs at least one column operand, got {args!r}')
+    return [_compile_operand(arg) for arg in args]
+
+
+def _crossover(left: np.ndarray, right: np.ndarray, above: bool) -> np.ndarray:
+    diff = np.asarray(left - right, dtype="float64")
+    current = diff > 0 if above else diff < 0
+    previous = np.zeros_like(current)
+    previous[1:] = diff[:-1] <= 0 if above else diff[:-1] >= 0
+    return current & previous
+
+
+def _compile_defined(rule: Dict[str, Any]) -> Evaluator:
+    # Where every operand of an already validated rule is a number, i.e. where
+    # its result is not just the False of a NaN comparison during warm-up
+    op, args = next(iter(rule.items()))
+    if op in ("all", "any"):
+        children = [_compile_defined(arg) for arg in args]
+        return lambda columns: np.logical_and.reduce([child(columns) for child in children])
+    if op == "not":
+        return _compile_defined(args)
+    left, right = _operands(op, args)
+
+    def defined(columns: Columns) -> np.ndarray:
+        current = ~np.isnan(np.asarray(left(columns) - right(columns), dtype="float64"))
+        if op in COMPARISONS:
+            return current
+        # A crossover also compares with the previous bar
+        previous = np.zeros_like(current)
+        previous[1:] = current[:-1]
+        return current & previous
+
+    return defined
+
+
+def compile_rule(rule: Dict[str, Any]) -> Evaluator:
+    """
+    Compile a rule once into a function of the column arrays that returns a
+    boolean array. Comparisons and crossovers are False where an operand is NaN
+    (indicator warm-up), and so is a negated condition.
+    """
+    if not isinstance(rule, dict) or len(rule) != 1:
+        raise SignalRuleError(f"A condition must be an object with one operator: {rule!r}")
+    op, args = next(iter(rule.items()))
+
+    if op in ("all", "any"):
+        if not isinstance(args, list) or not args:
+            raise SignalRuleError(f'"{op}" expects a non-empty list of conditions')
+        children = [compile_rule(arg) for arg in args]
+        reduce = np.logical_and.reduce if op == "all" else np.logical_or.reduce
+        return lambda columns: reduce([child(columns) for child in children])
+    if op == "not":
+        child = compile_rule(args)
+        defined = _compile_defined(args)
+        return lambda columns: ~child(columns) & defined(columns)
+    if op in COMPARISONS:
+        compare = COMPARISONS[op]
+        left, right = _operands(op, args)
+        return lambda columns: compare(left(columns), right(columns))
+    if op in CROSSOVERS:
+        left, right = _operands(op, args)
+        above = op == "cross_above"
+        return lambda columns: _crossover(left(columns), right(columns), above)
+    raise SignalRuleError(f"Unknown operator: {op!r}")
+
+
+def rule_columns(rule: Dict[str, Any]) -> Set[str]:
+    names: Set[str] = set()
+    for op, args in rule.items():
+        if op == "not":
+            names |= rule_columns(args)
+        elif op in ("all", "any"):
+            for arg in args:
+                names |= rule_columns(arg)
+        else:
+            names |= {arg for arg in args if isinstance(arg, str)}
+    return names
+
+
+class SignalRules:
+    """Compiled buy/sell rules of one strategy."""
+
+    def __init__(self, buy: Dict[str, Any], sell: Dict[str, Any], description: str = ""):
+        self._buy = compile_rule(buy)
+        self._sell = compile_rule(sell)
+        self.columns = rule_columns(buy) | rule_columns(sell)
+        self.description = description
+
+    @classmethod
+    def from_json(cls, rules: Union[str, Dict[str, Any]], description: str = "") -> "SignalRules":
+        if isinstance(rules, str):
+            rules = json.loads(rules)
+        if "buy" not in rules or "sell" not in rules:
+            raise SignalRuleError('Rules need both a "buy" and a "sell" condition.')
+        return cls(rules["buy"], rules["sell"], description)
+
+    def evaluate(self, columns: Columns) -> SignalArrayModel:
+        n_bars = len(next(iter(columns.values())))
+        with np.errstate(invalid="ignore"):
+            buy = np.broadcast_to(self._buy(columns), n_bars)
+            sell = np.broadcast_to(self._sell(columns), n_bars)
+        return SignalArrayModel(
+            BuySignal=np.array(buy, dtype=bool),
+            SellSignal=np.array(sell, dtype=bool),
+            Description=self.description,
+        )
+
+
+def generate_rule_signals(
+    stock_price_file_path: str,
+    rules: Union[str, Dict[str, Any]],
+    stock_signals_file_path: str,
+    description: str = "",
+) -> str:
+    """Evaluate rules on a `stock_data.csv` file and write the signal file."""
+    signal_rules = SignalRules.from_json(rules, description)
+    prices = read_price_csv(stock_price_file_path)
+    columns = {name: prices[name].to_numpy() for name in PRICE_COLUMNS}
+
+    # Feature columns come from the feature store, built once per price data version
+    missing = signal_rules.columns - columns.keys()
+    if missing:
+        features = FeatureStore().get(prices)
+        unknown = missing - set(features.columns)
+        if unknown:
+            raise SignalRuleError(f"Unknown columns in rules: {sorted(unknown)}")
+        columns.update({column: features[column].to_numpy() for column in missing})
+
+    signals = signal_rules.evaluate(columns)
+    return write_signals(
+        stock_signals_file_path,
+        signals.BuySignal,
+        signals.SellSignal,
+        signals.Description,
+        provenance={
+            "input_file": os.path.basename(stock_price_file_path),
+            "rules": rules if isinstance(rules, dict) else json.loads(rules),
+        },
+    )
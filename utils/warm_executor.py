@@ -0,0 +1,149 @@
+import os
+import subprocess
+import sys
+from hashlib import md5
+from multiprocessing.connection import Client, Connection
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from autogen.code_utils import PYTHON_VARIANTS, TIMEOUT_MSG
+from autogen.coding import CodeBlock, CodeExtractor, LocalCommandLineCodeExecutor
+from autogen.coding.base import CommandLineCodeResult
+from autogen.coding.markdown_code_extractor import MarkdownCodeExtractor
+from autogen.coding.utils import _get_file_name_from_content
+from .warm_worker import AUTHKEY_ENV, PRELOAD_MODULES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class WarmPythonCodeExecutor:
+    """
+    Code executor that runs Python blocks in one long-lived worker process.
+
+    The worker imports pandas and `ta` once and caches `pd.read_csv` results, so
+    repeated attempts skip interpreter start-up, imports and CSV parsing. Every
+    block still gets fresh globals; `restart()` replaces the worker (e.g.
+    between strategies), and a block exceeding `timeout` kills the worker and
+    reports a timeout like `LocalCommandLineCodeExecutor`. Non-Python blocks are
+    delegated to `LocalCommandLineCodeExecutor`.
+    """
+
+    def __init__(
+        self,
+        work_dir: Union[Path, str] = Path("."),
+        timeout: int = 600,
+        preload_modules: Tuple[str, ...] = PRELOAD_MODULES,
+    ):
+        self._work_dir = Path(work_dir).resolve()
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+        self._timeout = timeout
+        self._preload_modules = preload_modules
+        self._fallback = LocalCommandLineCodeExecutor(
+            work_dir=self._work_dir, timeout=timeout, execution_policies={"python": True}
+        )
+        self._process: Optional[subprocess.Popen] = None
+        self._conn: Optional[Connection] = None
+
+    @property
+    def code_extractor(self) -> CodeExtractor:
+        return MarkdownCodeExtractor()
+
+    @property
+    def work_dir(self) -> Path:
+        return self._work_dir
+
+    def _start(self) -> None:
+        authkey = os.urandom(16)
+        env = os.environ.copy()
+        env[AUTHKEY_ENV] = authkey.hex()
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+        )
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "utils.warm_worker", *self._preload_modules],
+            cwd=self._work_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        port = self._process.stdout.readline().strip()
+        if not port:
+            self._process.wait()
+            self._process = None
+            raise RuntimeError("The code execution worker failed to start.")
+        self._conn = Client(("127.0.0.1", int(port)), authkey=authkey)
+
+    def _run(self, code: str, file_path: Path) -> Dict[str, Any]:
+        if self._process is None or self._process.poll() is not None:
+            self.restart()
+            self._start()
+        self._conn.send(
+            {"code": code, "file_path": str(file_path), "work_dir": str(self._work_dir)}
+        )
+        if not self._conn.poll(self._timeout):
+            raise TimeoutError
+        try:
+            return self._conn.recv()
+        except EOFError:
+            self.restart()
+            return {"exit_code": 1, "output": "The code execution worker exited unexpectedly."}
+
+    def execute_code_blocks(self, code_blocks: List[CodeBlock]) -> CommandLineCodeResult:
+        logs_all = ""
+        exit_code = 0
+        code_file = None
+        for code_block in code_blocks:
+            if code_block.language not in PYTHON_VARIANTS:
+                result = self._fallback.execute_code_blocks([code_block])
+                logs_all += result.output
+                exit_code = result.exit_code
+                if exit_code != 0:
+                    break
+                continue
+
+            code = code_block.code
+            try:
+                filename = _get_file_name_from_content(code, self._work_dir)
+            except ValueError:
+                return CommandLineCodeResult(exit_code=1, output="Filename is not in the workspace")
+            if filename is None:
+                filename = f"tmp_code_{md5(code.encode()).hexdigest()}.py"
+            file_path = (self._work_dir / filename).resolve()
+            file_path.write_text(code, encoding="utf-8")
+            code_file = str(file_path)
+
+            try:
+                result = self._run(code, file_path)
+            except TimeoutError:
+                self.restart()
+                logs_all += "\n" + TIMEOUT_MSG
+                exit_code = 124
+                break
+            logs_all += result["output"]
+            exit_code = result["exit_code"]
+            if exit_code != 0:
+                break
+
+        return CommandLineCodeResult(exit_code=exit_code, output=logs_all, code_file=code_file)
+
+    def restart(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def __del__(self):
+        try:
+            self.restart()
+        except Exception:
+            pass
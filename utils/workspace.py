@@ -0,0 +1,129 @@
+import os
+import re
+import shutil
+import stat
+import threading
+from typing import Iterable, List
+from .const import (
+    DATASET_STOCK,
+    INDICATOR_CACHE_DIR,
+    PRICE_STORE_DIR,
+    SIGNAL_CODE_CACHE_DIR,
+    WORK_DIR,
+)
+from .functions import fetch_stock_data
+
+WORKSPACES_DIR_NAME = "_workspaces"
+SHARED_DIR_NAME = "_shared"
+# Caches shared across strategies, which removing a workspace must never delete
+SHARED_CACHE_DIRS = (PRICE_STORE_DIR, INDICATOR_CACHE_DIR, SIGNAL_CODE_CACHE_DIR)
+# Strategies running side by side must not fetch the same shared file twice
+_shared_data_lock = threading.Lock()
+
+
+def sanitize_dir_name(name: str) -> str:
+    return re.sub(r'[<>:"/\\|?*]', "_", name).strip() or "_"
+
+
+def shared_price_file_path(
+    ticker: str, start_date: str, end_date: str, root_dir: str = WORK_DIR
+) -> str:
+    # One read-only price file per ticker and date range, linked into workspaces
+    file_name = sanitize_dir_name(f"{ticker}_{start_date}_{end_date}.csv")
+    return os.path.join(root_dir, SHARED_DIR_NAME, file_name)
+
+
+def link_read_only(src_file_path: str, dest_file_path: str) -> str:
+    """
+    Hard link `src_file_path` to `dest_file_path` (a copy when linking is not
+    possible, e.g. across file systems) and mark it read-only.
+    """
+    if os.path.lexists(dest_file_path):
+        os.remove(dest_file_path)
+    try:
+        os.link(src_file_path, dest_file_path)
+    except OSError:
+        shutil.copyfile(src_file_path, dest_file_path)
+    os.chmod(dest_file_path, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+    return dest_file_path
+
+
+def _has_price_rows(file_path: str) -> bool:
+    # A header-only file left by an older failed download is fetched again
+    if not os.path.exists(file_path):
+        return False
+    with open(file_path, "r", encoding="utf-8") as f:
+        return bool(f.readline() and f.readline().strip())
+
+
+def link_stock_data(
+    ticker: str, start_date: str, end_date: str, work_dir: str, root_dir: str = WORK_DIR
+) -> str:
+    """Fetch the price data into the shared directory once and link it into `work_dir`."""
+    shared_file_path = shared_price_file_path(ticker, start_date, end_date, root_dir)
+    with _shared_data_lock:
+        if not _has_price_rows(shared_file_path):
+            os.makedirs(os.path.dirname(shared_file_path), exist_ok=True)
+            fetch_stock_data(ticker, start_date, end_date, shared_file_path)
+    return link_read_only(shared_file_path, os.path.join(work_dir, DATASET_STOCK))
+
+
+def _remove_read_only(func, path, _):
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+
+class StrategyWorkspace:
+    """
+    Scratch directory of one strategy run. Generated code, tools and plots read
+    and write their fixed file names here, so strategies do not clobber each
+    other; shared price data is linked in read-only.
+    """
+
+    def __init__(self, name: str, root_dir: str = WORK_DIR):
+        self.name = name
+        self.root_dir = root_dir
+        self.work_dir = os.path.join(root_dir, WORKSPACES_DIR_NAME, sanitize_dir_name(name))
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    def path(self, file_name: str) -> str:
+        return os.path.join(self.work_dir, file_name)
+
+    def link_shared(self, src_file_path: str, file_name: str = DATASET_STOCK) -> str:
+        return link_read_only(src_file_path, self.path(file_name))
+
+    def publish(self, file_names: Iterable[str], dest_dir: str) -> List[str]:
+        """Move the given files, where present, into `dest_dir`."""
+        os.makedirs(dest_dir, exist_ok=True)
+        moved = []
+        for file_name in file_names:
+            src_file_path = self.path(file_name)
+            if os.path.exists(src_file_path):
+                dest_file_path = os.path.join(dest_dir, file_name)
+                if os.path.exists(dest_file_path):
+                    os.chmod(dest_file_path, stat.S_IWRITE | stat.S_IREAD)
+                os.replace(src_file_path, dest_file_path)
+                moved.append(dest_file_path)
+        return moved
+
+    def _check_no_shared_cache(self) -> None:
+        work_dir = os.path.realpath(self.work_dir)
+        for cache_dir in SHARED_CACHE_DIRS:
+            cache_dir = os.path.realpath(cache_dir)
+            if os.path.commonpath([work_dir, cache_dir]) == work_dir:
+                raise ValueError(
+                    f'The shared cache "{cache_dir}" is inside the workspace "{work_dir}".'
+                )
+
+    def clear(self) -> None:
+        """Remove the files left in the workspace by an earlier run."""
+        self._check_no_shared_cache()
+        for entry in os.scandir(self.work_dir):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, onerror=_remove_read_only)
+            else:
+                _remove_read_only(os.remove, entry.path, None)
+
+    def remove(self) -> None:
+        self._check_no_shared_cache()
+        shutil.rmtree(self.work_dir, onerror=_remove_read_only)